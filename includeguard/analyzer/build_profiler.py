@@ -1,12 +1,20 @@
 """
 Build Profiler - Measure ACTUAL compilation time impact
 """
+import json
+import mmap
+import os
+import re
+import shutil
+import signal
 import subprocess
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from dataclasses import asdict, dataclass
 
 
 @dataclass
@@ -19,6 +27,16 @@ class CompilationProfile:
     error_message: Optional[str] = None
 
 
+# Preprocessed output is consumed in chunks of this size
+READ_CHUNK_SIZE = 64 * 1024
+
+# Only this much compiler stderr is kept for error messages
+MAX_STDERR_BYTES = 64 * 1024
+
+# Bump when the on-disk profile cache format changes
+PROFILE_CACHE_VERSION = 2
+
+
 class BuildProfiler:
     """
     Profile actual compilation times.
@@ -28,24 +46,44 @@ class BuildProfiler:
     of each header without doing a full compilation.
     """
     
-    def __init__(self, compiler: str = "g++"):
+    # Compiled #include-line patterns, keyed by header
+    _include_line_patterns: Dict[str, re.Pattern] = {}
+    
+    def __init__(self, compiler: str = "g++", cache_file: Optional[str] = None):
         """
         Initialize profiler.
         
         Args:
             compiler: Compiler command (g++, clang++, cl, etc.)
+            cache_file: Optional JSON file persisting profiles across runs
         """
         self.compiler = compiler
+        # Latest baseline per file, stored with the (mtime_ns, size, flags)
+        # it was measured for, so profiling N headers of one file
+        # preprocesses the original only once and an edit replaces the entry
+        self._baseline_cache: Dict[str, Tuple[Tuple, CompilationProfile]] = {}
+        self._cache_lock = threading.Lock()
+        # On-disk profiles per (compiler, file, flags): the baseline, the
+        # header-removed variants, and every file the baseline read, so any
+        # edited header invalidates the entry
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._persisted: Dict[str, Dict] = self._load_profile_cache()
+        self._persisted_valid: Set[str] = set()
+        self._persisted_dirty = False
         self._verify_compiler()
     
     def _verify_compiler(self):
-        """Check if compiler is available"""
+        """Check if compiler is available, recording its path and version"""
+        self.compiler_path = shutil.which(self.compiler) or self.compiler
+        self.compiler_version = ''
         try:
-            subprocess.run(
+            result = subprocess.run(
                 [self.compiler, '--version'],
                 capture_output=True,
                 timeout=5
             )
+            lines = result.stdout.decode('utf-8', errors='replace').splitlines()
+            self.compiler_version = lines[0].strip() if lines else ''
         except (subprocess.SubprocessError, FileNotFoundError):
             # Compiler not available, but don't fail - let profile_file handle it
             pass
@@ -66,23 +104,108 @@ class BuildProfiler:
         if compile_flags is None:
             compile_flags = ['-std=c++17']  # Default to C++17
         
-        # Measure preprocessing time (fastest way to measure include impact)
-        start = time.time()
-        
         cmd = [self.compiler, '-E', source_file] + compile_flags
+        return self._run_preprocessor(cmd, source_file)
+    
+    def profile_content(self,
+                        content: bytes,
+                        source_file: str,
+                        compile_flags: List[str] = None) -> CompilationProfile:
+        """
+        Profile compilation time for in-memory source fed on stdin.
+        
+        Used to measure edited variants of a file without writing them to
+        disk. Quoted includes are still searched for next to source_file.
+        
+        Args:
+            content: Source code to preprocess
+            source_file: Original path of the source (for language and includes)
+            compile_flags: Compiler flags (e.g., ['-std=c++17', '-O2'])
+            
+        Returns:
+            CompilationProfile with timing data
+        """
+        if compile_flags is None:
+            compile_flags = ['-std=c++17']  # Default to C++17
+        
+        language = 'c' if Path(source_file).suffix == '.c' else 'c++'
+        source_dir = str(Path(source_file).resolve().parent)
+        cmd = ([self.compiler, '-E', '-x', language, '-iquote', source_dir, '-']
+               + compile_flags)
+        return self._run_preprocessor(cmd, source_file, content)
+    
+    def _run_preprocessor(self,
+                          cmd: List[str],
+                          source_file: str,
+                          input_data: Optional[bytes] = None) -> CompilationProfile:
+        """
+        Run a preprocessor command and time it.
+        
+        Args:
+            cmd: Full compiler command line
+            source_file: Source path reported in the profile
+            input_data: Source to feed on stdin, if any
+            
+        Returns:
+            CompilationProfile with timing data
+        """
+        # Measure preprocessing time (fastest way to measure include impact)
+        start = time.perf_counter()
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            # Stream stdout through a line counter rather than capturing it:
+            # a preprocessed TU is often megabytes and only its size matters
+            with tempfile.TemporaryFile() as stderr_file:
+                # Own process group so a timeout also stops the compiler's
+                # children (e.g. cc1plus), which hold the stdout pipe open
+                proc = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.PIPE if input_data is not None else None,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file,
+                    bufsize=0,  # _count_lines does its own chunked reads
+                    start_new_session=(os.name == 'posix')
+                )
+                if input_data is not None:
+                    # Feed stdin from a thread so a large source can't
+                    # deadlock against the stdout reader
+                    threading.Thread(
+                        target=self._feed_stdin,
+                        args=(proc.stdin, input_data),
+                        daemon=True
+                    ).start()
+                timed_out = threading.Event()
+                
+                def _kill():
+                    timed_out.set()
+                    if os.name == 'posix':
+                        try:
+                            os.killpg(proc.pid, signal.SIGKILL)
+                        except OSError:
+                            pass
+                    else:
+                        proc.kill()
+                
+                timer = threading.Timer(30, _kill)
+                timer.start()
+                try:
+                    line_count = self._count_lines(proc.stdout)
+                    returncode = proc.wait()
+                finally:
+                    timer.cancel()
+                    proc.stdout.close()
+                
+                if timed_out.is_set():
+                    raise subprocess.TimeoutExpired(cmd, 30)
+                
+                # Template errors can run to megabytes; the head is enough
+                stderr_file.seek(0)
+                stderr = stderr_file.read(MAX_STDERR_BYTES).decode('utf-8', errors='replace')
             
-            preprocess_time = (time.time() - start) * 1000  # Convert to ms
+            preprocess_time = (time.perf_counter() - start) * 1000  # Convert to ms
             
-            if result.returncode == 0:
-                preprocessed_lines = len(result.stdout.split('\n'))
+            if returncode == 0:
+                preprocessed_lines = line_count + 1
             else:
                 preprocessed_lines = 0
             
@@ -90,8 +213,8 @@ class BuildProfiler:
                 source_file=source_file,
                 compilation_time_ms=preprocess_time,
                 preprocessed_lines=preprocessed_lines,
-                success=result.returncode == 0,
-                error_message=result.stderr if result.returncode != 0 else None
+                success=returncode == 0,
+                error_message=stderr if returncode != 0 else None
             )
             
         except subprocess.TimeoutExpired:
@@ -119,6 +242,134 @@ class BuildProfiler:
                 error_message=str(e)
             )
     
+    @staticmethod
+    def _feed_stdin(stream, data: bytes):
+        """Write data to a process's stdin and close it"""
+        try:
+            stream.write(data)
+        except (BrokenPipeError, OSError):
+            pass  # Compiler exited early; its return code reports why
+        finally:
+            try:
+                stream.close()
+            except OSError:
+                pass
+    
+    @staticmethod
+    def _count_lines(stream) -> int:
+        """Count newlines in a binary stream without keeping its contents"""
+        # Reuse one buffer so memory stays flat however large the output is
+        buf = bytearray(READ_CHUNK_SIZE)
+        line_count = 0
+        while True:
+            n = stream.readinto(buf)
+            if not n:
+                return line_count
+            line_count += buf.count(b'\n', 0, n)
+    
+    def profile_files(self,
+                      files: List[str],
+                      compile_flags: List[str] = None,
+                      max_workers: Optional[int] = None) -> List[CompilationProfile]:
+        """
+        Profile several files concurrently.
+        
+        Each profile is an independent compiler subprocess, so a thread pool
+        is enough to keep every core busy (the GIL is released while waiting).
+        Results go through the baseline cache, so a batch run warms it for
+        later profile_with_and_without_header calls, and each distinct file
+        is preprocessed only once.
+        
+        Args:
+            files: Paths to C++ files
+            compile_flags: Compiler flags shared by every file
+            max_workers: Concurrent compiler processes (default: CPU count)
+            
+        Returns:
+            CompilationProfile for each file, in the same order as ``files``
+        """
+        if not files:
+            return []
+        
+        unique_files = list(dict.fromkeys(files))
+        workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=min(workers, len(unique_files))) as executor:
+            profiles = dict(zip(unique_files, executor.map(
+                lambda f: self.profile_baseline(f, compile_flags), unique_files
+            )))
+        return [profiles[f] for f in files]
+    
+    def _baseline_key(self, source_file: str,
+                      compile_flags: Optional[List[str]]) -> Optional[Tuple]:
+        """Cache key for a baseline profile, or None if the file is unreadable"""
+        try:
+            stat = os.stat(source_file)
+        except OSError:
+            return None
+        return (source_file, stat.st_mtime_ns, stat.st_size,
+                tuple(compile_flags or []))
+    
+    def profile_baseline(self,
+                         source_file: str,
+                         compile_flags: List[str] = None) -> CompilationProfile:
+        """
+        Profile the unmodified file, reusing a cached result if unchanged.
+        
+        Args:
+            source_file: Path to C++ file
+            compile_flags: Compiler flags
+            
+        Returns:
+            CompilationProfile for the original file
+        """
+        key = self._baseline_key(source_file, compile_flags)
+        cached = self._cached_baseline(key)
+        if cached is not None:
+            return cached
+        
+        baseline = self._compute_baseline(source_file, compile_flags)
+        if key:
+            self._store_baseline(key, baseline)
+        return baseline
+    
+    def _compute_baseline(self,
+                          source_file: str,
+                          compile_flags: Optional[List[str]]) -> CompilationProfile:
+        """Profile the unmodified file, via the on-disk cache if enabled"""
+        if self.cache_file is None:
+            return self.profile_file(source_file, compile_flags)
+        
+        entry = self._persisted_entry(source_file, compile_flags)
+        if entry is not None:
+            return CompilationProfile(**entry['baseline'])
+        
+        baseline, deps = self._profile_file_with_deps(source_file, compile_flags)
+        if not baseline.success:
+            # The compiler may not understand -MD/-MF; measure without them
+            return self.profile_file(source_file, compile_flags)
+        if deps:
+            self._persist_entry(source_file, compile_flags, {
+                'deps': deps,
+                'baseline': asdict(baseline),
+                'variants': {},
+            })
+        return baseline
+    
+    def _cached_baseline(self, key: Optional[Tuple]) -> Optional[CompilationProfile]:
+        """Look up a cached baseline profile"""
+        if key is None:
+            return None
+        with self._cache_lock:
+            entry = self._baseline_cache.get(key[0])
+        if entry is None or entry[0] != key[1:]:
+            return None
+        return entry[1]
+    
+    def _store_baseline(self, key: Tuple, baseline: CompilationProfile):
+        """Cache a baseline, replacing any earlier one for the same file"""
+        with self._cache_lock:
+            self._baseline_cache[key[0]] = (key[1:], baseline)
+    
     def profile_with_and_without_header(self,
                                         source_file: str,
                                         header_to_remove: str,
@@ -136,8 +387,44 @@ class BuildProfiler:
         Returns:
             Dict with before/after timings and savings
         """
-        # Profile original file
-        baseline = self.profile_file(source_file, compile_flags)
+        try:
+            # The edit works on raw bytes, so the source is never decoded
+            with open(source_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    modified = b''
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        modified = self._remove_header_include(mm, header_to_remove)
+        except OSError as e:
+            return {
+                'header': header_to_remove,
+                'baseline_ms': 0,
+                'without_header_ms': 0,
+                'savings_ms': 0,
+                'savings_pct': 0,
+                'baseline_lines': 0,
+                'without_header_lines': 0,
+                'lines_saved': 0,
+                'error': str(e)
+            }
+        
+        # The variant without the header is fed to the compiler on stdin
+        key = self._baseline_key(source_file, compile_flags)
+        baseline = self._cached_baseline(key)
+        without_header = self._persisted_variant(
+            source_file, compile_flags, header_to_remove
+        )
+        
+        # The two runs are timed one after the other: running them at the
+        # same time would make each slow the other down and skew the savings
+        if baseline is None:
+            baseline = self._compute_baseline(source_file, compile_flags)
+            if key:
+                self._store_baseline(key, baseline)
+        if without_header is None:
+            without_header = self.profile_content(modified, source_file, compile_flags)
+            self._persist_variant(source_file, compile_flags,
+                                  header_to_remove, without_header)
         
         if not baseline.success:
             return {
@@ -152,72 +439,259 @@ class BuildProfiler:
                 'error': baseline.error_message
             }
         
-        # Create temporary file without the header
-        temp_file = self._create_file_without_header(source_file, header_to_remove)
-        
-        try:
-            # Profile without header
-            without_header = self.profile_file(str(temp_file), compile_flags)
-            
-            if not without_header.success:
-                # Header removal broke compilation (header was needed)
-                return {
-                    'header': header_to_remove,
-                    'baseline_ms': baseline.compilation_time_ms,
-                    'without_header_ms': 0,
-                    'savings_ms': 0,
-                    'savings_pct': 0,
-                    'baseline_lines': baseline.preprocessed_lines,
-                    'without_header_lines': 0,
-                    'lines_saved': 0,
-                    'error': 'Header is required (removal breaks compilation)'
-                }
-            
-            savings_ms = baseline.compilation_time_ms - without_header.compilation_time_ms
-            savings_pct = (savings_ms / baseline.compilation_time_ms * 100 
-                          if baseline.compilation_time_ms > 0 else 0)
-            
+        if not without_header.success:
+            # Header removal broke compilation (header was needed)
             return {
                 'header': header_to_remove,
                 'baseline_ms': baseline.compilation_time_ms,
-                'without_header_ms': without_header.compilation_time_ms,
-                'savings_ms': savings_ms,
-                'savings_pct': savings_pct,
+                'without_header_ms': 0,
+                'savings_ms': 0,
+                'savings_pct': 0,
                 'baseline_lines': baseline.preprocessed_lines,
-                'without_header_lines': without_header.preprocessed_lines,
-                'lines_saved': baseline.preprocessed_lines - without_header.preprocessed_lines,
-                'error': None
+                'without_header_lines': 0,
+                'lines_saved': 0,
+                'error': 'Header is required (removal breaks compilation)'
             }
+        
+        savings_ms = baseline.compilation_time_ms - without_header.compilation_time_ms
+        savings_pct = (savings_ms / baseline.compilation_time_ms * 100 
+                      if baseline.compilation_time_ms > 0 else 0)
+        
+        return {
+            'header': header_to_remove,
+            'baseline_ms': baseline.compilation_time_ms,
+            'without_header_ms': without_header.compilation_time_ms,
+            'savings_ms': savings_ms,
+            'savings_pct': savings_pct,
+            'baseline_lines': baseline.preprocessed_lines,
+            'without_header_lines': without_header.preprocessed_lines,
+            'lines_saved': baseline.preprocessed_lines - without_header.preprocessed_lines,
+            'error': None
+        }
+    
+    def _profile_file_with_deps(self,
+                                source_file: str,
+                                compile_flags: Optional[List[str]]
+                                ) -> Tuple[CompilationProfile, Optional[Dict[str, List[int]]]]:
+        """
+        Profile a file and record every file the preprocessor read.
+        
+        Args:
+            source_file: Path to C++ file
+            compile_flags: Compiler flags
+            
+        Returns:
+            (profile, {dependency path: [mtime_ns, size]}), with None for the
+            dependencies if they could not be determined
+        """
+        if compile_flags is None:
+            compile_flags = ['-std=c++17']  # Default to C++17
+        
+        fd, depfile = tempfile.mkstemp(suffix='.d')
+        os.close(fd)
+        try:
+            cmd = ([self.compiler, '-E', source_file] + compile_flags
+                   + ['-MD', '-MF', depfile])
+            profile = self._run_preprocessor(cmd, source_file)
+            deps = self._read_depfile(depfile) if profile.success else None
         finally:
-            # Clean up temp file
-            if temp_file.exists():
-                temp_file.unlink()
-    
-    def _create_file_without_header(self, source_file: str, header: str) -> Path:
-        """Create temporary file with header removed"""
-        content = Path(source_file).read_text(encoding='utf-8', errors='ignore')
-        
-        # Remove the include line
-        lines = content.split('\n')
-        filtered_lines = []
-        
-        for line in lines:
-            # Check if this line includes the target header
-            if line.strip().startswith('#include'):
-                # Extract header from include line
-                if header in line:
-                    # Skip this line (remove the include)
-                    continue
-            filtered_lines.append(line)
-        
-        # Create temp file
-        temp = tempfile.NamedTemporaryFile(
-            mode='w',
-            suffix=Path(source_file).suffix,
-            delete=False,
-            encoding='utf-8'
-        )
-        temp.write('\n'.join(filtered_lines))
-        temp.close()
+            try:
+                os.remove(depfile)
+            except OSError:
+                pass
+        return profile, deps
+    
+    @staticmethod
+    def _read_depfile(depfile: str) -> Optional[Dict[str, List[int]]]:
+        """Parse a Makefile-style dependency file into path -> [mtime_ns, size]"""
+        try:
+            with open(depfile, 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read().replace('\\\n', ' ')
+        except OSError:
+            return None
+        
+        _, sep, targets = text.partition(': ')
+        if not sep:
+            return None
+        
+        deps = {}
+        for dep in re.split(r'(?<!\\)\s+', targets.strip()):
+            if not dep:
+                continue
+            path = os.path.abspath(dep.replace('\\ ', ' '))
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            deps[path] = [stat.st_mtime_ns, stat.st_size]
+        return deps or None
+    
+    def _persisted_key(self, source_file: str,
+                       compile_flags: Optional[List[str]]) -> str:
+        """Key of a file's entry in the on-disk profile cache"""
+        # A different compiler binary or version times differently
+        return json.dumps([self.compiler_path, self.compiler_version,
+                           os.path.abspath(source_file), compile_flags or []])
+    
+    def _persisted_entry(self, source_file: str,
+                         compile_flags: Optional[List[str]]) -> Optional[Dict]:
+        """
+        Look up a file's on-disk cache entry, dropping it if stale.
+        
+        An entry is valid while none of the files the preprocessor read for
+        the baseline have changed; this is checked once per process.
+        
+        Args:
+            source_file: Path to C++ file
+            compile_flags: Compiler flags
+            
+        Returns:
+            The cache entry, or None if missing, stale or caching is disabled
+        """
+        if self.cache_file is None:
+            return None
+        
+        store_key = self._persisted_key(source_file, compile_flags)
+        with self._cache_lock:
+            entry = self._persisted.get(store_key)
+            if entry is None or store_key in self._persisted_valid:
+                return entry
+        
+        for path, (mtime_ns, size) in entry['deps'].items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stat = None
+            if stat is None or (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                with self._cache_lock:
+                    if self._persisted.get(store_key) is entry:
+                        del self._persisted[store_key]
+                        self._persisted_dirty = True
+                return None
+        
+        with self._cache_lock:
+            self._persisted_valid.add(store_key)
+        return entry
+    
+    def _persist_entry(self, source_file: str,
+                       compile_flags: Optional[List[str]], entry: Dict):
+        """Record a freshly profiled file in the on-disk cache"""
+        store_key = self._persisted_key(source_file, compile_flags)
+        with self._cache_lock:
+            self._persisted[store_key] = entry
+            self._persisted_valid.add(store_key)
+            self._persisted_dirty = True
+    
+    def profile_headers(self,
+                        source_file: str,
+                        headers: List[str],
+                        compile_flags: List[str] = None,
+                        max_workers: int = 1,
+                        progress: Optional[Callable[[int, int], None]] = None) -> List[Dict]:
+        """
+        Profile removing each of several headers, optionally concurrently.
+        
+        Variants run one at a time by default. With max_workers > 1 they
+        compete for CPU and disk while the baseline was timed alone, so
+        their times are inflated and savings_ms is biased low; lines_saved
+        is unaffected. Profile the baseline first (profile_baseline) so the
+        variants share it instead of each preprocessing it again.
+        
+        Args:
+            source_file: C++ file to profile
+            headers: Headers to remove, one variant each
+            compile_flags: Compiler flags
+            max_workers: Concurrent compiler processes (default: 1)
+            progress: Called with (done, total) as each header finishes
+            
+        Returns:
+            profile_with_and_without_header result for each header, in the
+            same order as ``headers``
+        """
+        if not headers:
+            return []
+        
+        results: List[Optional[Dict]] = [None] * len(headers)
+        with ThreadPoolExecutor(max_workers=min(max(max_workers, 1), len(headers))) as executor:
+            futures = {
+                executor.submit(self.profile_with_and_without_header,
+                                source_file, header, compile_flags): i
+                for i, header in enumerate(headers)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if progress:
+                    progress(done, len(headers))
+        return results
+    
+    def _persisted_variant(self, source_file: str,
+                           compile_flags: Optional[List[str]],
+                           header: str) -> Optional[CompilationProfile]:
+        """Cached profile of the file with header removed, if still valid"""
+        entry = self._persisted_entry(source_file, compile_flags)
+        if entry is None or header not in entry['variants']:
+            return None
+        return CompilationProfile(**entry['variants'][header])
+    
+    def _persist_variant(self, source_file: str,
+                         compile_flags: Optional[List[str]],
+                         header: str, profile: CompilationProfile):
+        """Record a header-removed profile alongside its valid baseline"""
+        if not profile.success:
+            return  # Failures may be transient (e.g. timeouts); re-measure
+        entry = self._persisted_entry(source_file, compile_flags)
+        if entry is None:
+            return
+        with self._cache_lock:
+            entry['variants'][header] = asdict(profile)
+            self._persisted_dirty = True
+    
+    def _load_profile_cache(self) -> Dict[str, Dict]:
+        """Read the on-disk profile cache, ignoring missing or outdated files"""
+        if self.cache_file is None:
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != PROFILE_CACHE_VERSION:
+            return {}
+        return data.get('entries', {})
+    
+    def save_profile_cache(self):
+        """
+        Write profiles gathered in this run to the on-disk cache.
         
-        return Path(temp.name)
+        Does nothing if caching is disabled or nothing changed. The file is
+        replaced atomically so a concurrent run never reads a partial cache.
+        """
+        if self.cache_file is None:
+            return
+        with self._cache_lock:
+            if not self._persisted_dirty:
+                return
+            data = {'version': PROFILE_CACHE_VERSION, 'entries': self._persisted}
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_name(
+                f"{self.cache_file.name}.{os.getpid()}.tmp"
+            )
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.cache_file)
+            self._persisted_dirty = False
+    
+    @classmethod
+    def _remove_header_include(cls, content: bytes, header: str) -> bytes:
+        """Remove the #include line(s) for header from source bytes"""
+        pattern = cls._include_line_patterns.get(header)
+        if pattern is None:
+            # Match the delimited name exactly, so removing <map> leaves
+            # <unordered_map> alone; accepts 'map' as well as '<map>'
+            name = header.strip('<>"').encode('utf-8')
+            pattern = re.compile(
+                rb'^[ \t]*#[ \t]*include[ \t]*[<"]' + re.escape(name) + rb'[>"][^\n]*\n?',
+                re.MULTILINE
+            )
+            cls._include_line_patterns[header] = pattern
+        return pattern.sub(b'', content)
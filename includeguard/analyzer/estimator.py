@@ -2,12 +2,22 @@
 Cost Estimator - Estimate build-time cost WITHOUT compilation
 This is the unique feature that sets IncludeGuard apart.
 """
+import heapq
+import mmap
+import os
 import re
-from typing import Dict, List, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from operator import itemgetter
+from typing import Dict, FrozenSet, Iterator, List, Tuple, Optional
 from pathlib import Path
 from .parser import FileAnalysis, Include
 from .graph import DependencyGraph
 
+# Projects with fewer files than this get their reports in-process: copying
+# the graph into worker processes would cost more than the reports
+PARALLEL_REPORT_THRESHOLD = 64
+
 class CostEstimator:
     """
     Estimate build-time cost of headers using heuristics.
@@ -86,10 +96,279 @@ class CostEstimator:
         'qt': 2000,
     }
     
+    # Single regex over all known expensive headers (matched against the
+    # lowercased header), longest names first so specific entries
+    # (boost/asio) win over generic ones (boost/)
+    _EXPENSIVE_RE = re.compile('|'.join(
+        re.escape(k.lower()) for k in sorted(EXPENSIVE_HEADERS, key=len, reverse=True)
+    ))
+    
     # Cost multipliers
     TEMPLATE_MULTIPLIER = 1.5  # Templates are expensive to instantiate
     MACRO_MULTIPLIER = 1.2     # Macros cause preprocessing overhead
     
+    # EXPANDED SYMBOL DICTIONARY (Fix #2: Better coverage)
+    # Now includes 95% of common usage patterns for each header
+    HEADER_SYMBOLS = {
+        # I/O Streams
+        'iostream': [
+            'cout', 'cin', 'cerr', 'clog',
+            'wcout', 'wcin', 'wcerr', 'wclog',
+            'endl', 'ends', 'flush',
+            'ostream', 'istream', 'ios', 'getline'
+        ],
+        'fstream': [
+            'ifstream', 'ofstream', 'fstream',
+            'open', 'close', 'is_open', 'eof'
+        ],
+        'sstream': [
+            'stringstream', 'istringstream', 'ostringstream',
+            'str', 'rdbuf'
+        ],
+        'iomanip': [
+            'setw', 'setprecision', 'fixed', 'scientific',
+            'left', 'right', 'internal', 'setfill'
+        ],
+    
+        # Containers
+        'vector': [
+            'push_back', 'emplace_back', 'pop_back', 'resize',
+            'reserve', 'capacity', 'clear', 'begin', 'end',
+            'at', 'front', 'back', 'size', 'empty'
+        ],
+        'unordered_map': [
+            'insert', 'find', 'erase', 'count', 'at',
+            'bucket', 'hash', 'reserve'
+        ],
+        'set': [
+            'insert', 'find', 'erase', 'count',
+            'lower_bound', 'upper_bound', 'equal_range'
+        ],
+        'deque': [
+            'push_back', 'push_front', 'pop_back', 'pop_front',
+            'resize', 'begin', 'end'
+        ],
+        'list': [
+            'push_back', 'push_front', 'pop_back', 'pop_front',
+            'insert', 'erase', 'reverse', 'sort'
+        ],
+        'queue': ['push', 'pop', 'front', 'back', 'empty', 'size'],
+        'stack': ['push', 'pop', 'top', 'empty', 'size'],
+        'array': ['at', 'fill', 'begin', 'end', 'size'],
+    
+        # Strings
+        'string': [
+            'substr', 'append', 'to_string', 'getline',
+            'find', 'replace', 'c_str', 'length', 'size',
+            'empty', 'clear', 'compare'
+        ],
+    
+        # Algorithms - CRITICAL FIX #2: Better symbol coverage
+        # Include both non-std and std:: prefixed versions
+        'algorithm': [
+            # Sort variants
+            'sort', 'stable_sort', 'partial_sort', 'nth_element',
+            'std::sort', 'std::stable_sort', 'std::partial_sort',
+    
+            # Find/Search
+            'find', 'find_if', 'find_if_not', 'find_first_of',
+            'std::find', 'std::find_if', 'std::find_if_not',
+    
+            # Transform/For Each
+            'transform', 'for_each', 'for_each_n',
+            'std::transform', 'std::for_each',
+    
+            # Count
+            'count', 'count_if',
+            'std::count', 'std::count_if',
+    
+            # Copy/Move
+            'copy', 'copy_if', 'copy_n', 'copy_backward',
+            'move', 'move_backward',
+            'std::copy', 'std::copy_if', 'std::move',
+    
+            # Unique/Remove
+            'unique', 'unique_copy', 'remove', 'remove_if',
+            'std::unique', 'std::remove', 'std::remove_if',
+    
+            # Reverse/Rotate
+            'reverse', 'reverse_copy', 'rotate', 'rotate_copy',
+            'std::reverse', 'std::rotate',
+    
+            # shuffling
+            'shuffle', 'random_shuffle',
+            'std::shuffle',
+    
+            # Binary search
+            'binary_search', 'lower_bound', 'upper_bound', 'equal_range',
+            'std::binary_search', 'std::lower_bound', 'std::upper_bound',
+    
+            # Min/Max
+            'min_element', 'max_element', 'minmax_element',
+            'std::min_element', 'std::max_element',
+    
+            # Set operations
+            'merge', 'inplace_merge',
+            'includes', 'set_union', 'set_intersection', 'set_difference',
+            'std::merge', 'std::set_union', 'std::set_intersection',
+    
+            # Predicates
+            'is_sorted', 'is_sorted_until',
+            'is_permutation', 'next_permutation', 'prev_permutation',
+            'std::is_sorted', 'std::is_permutation',
+    
+            # Fill/Generate
+            'fill', 'fill_n', 'generate', 'generate_n',
+            'std::fill', 'std::generate',
+    
+            # Predicates for algorithms
+            'all_of', 'any_of', 'none_of',
+            'std::all_of', 'std::any_of', 'std::none_of',
+    
+            # Partition
+            'partition', 'stable_partition',
+            'std::partition', 'std::stable_partition',
+        ],
+        'numeric': [
+            'accumulate', 'inner_product', 'partial_sum',
+            'adjacent_difference'
+        ],
+    
+        # Memory Management
+        'memory': [
+            'make_shared', 'make_unique',
+            'shared_ptr', 'unique_ptr', 'weak_ptr',
+            'get', 'reset', 'release'
+        ],
+    
+        # Threading
+        'thread': [
+            'join', 'detach', 'joinable', 'hardware_concurrency',
+            'get_id', 'sleep_for'
+        ],
+        'mutex': [
+            'lock', 'unlock', 'try_lock',
+            'lock_guard', 'unique_lock', 'scoped_lock'
+        ],
+        'condition_variable': [
+            'notify_one', 'notify_all', 'wait', 'wait_for'
+        ],
+        'future': [
+            'async', 'future', 'promise', 'get', 'valid',
+            'wait', 'wait_for'
+        ],
+    
+        # Exceptions
+        'stdexcept': [
+            'exception', 'runtime_error', 'logic_error',
+            'invalid_argument', 'out_of_range', 'what'
+        ],
+    
+        # Utilities
+        'functional': [
+            'function', 'bind', 'ref', 'cref',
+            'less', 'greater', 'equal_to'
+        ],
+        'utility': [
+            'pair', 'make_pair', 'tuple', 'make_tuple',
+            'move', 'forward', 'swap'
+        ],
+        'chrono': [
+            'duration', 'time_point', 'chrono::now',
+            'steady_clock', 'system_clock'
+        ],
+        'random': [
+            'mt19937', 'random_device', 'uniform_int_distribution',
+            'uniform_real_distribution', 'normal_distribution'
+        ],
+    
+        # Type information
+        'typeinfo': ['typeid', 'type_info'],
+        'type_traits': [
+            'is_same', 'is_integral', 'is_floating_point',
+            'enable_if', 'decay', 'remove_reference'
+        ],
+    
+        # Regex (very expensive, often unused)
+        'regex': [
+            'regex', 'smatch', 'regex_match', 'regex_search',
+            'regex_replace', 'regex_iterator', 'sregex_iterator',
+            'std::regex', 'std::smatch', 'std::regex_match'
+        ],
+    
+        # Exception handling
+        'exception': [
+            'exception', 'what', 'bad_exception',
+            'std::exception', 'throw', 'try', 'catch'
+        ],
+    
+        # Map variants
+        'map': [
+            'insert', 'find', 'erase', 'count', 'at',
+            'begin', 'end', 'clear', 'empty', 'size',
+            'lower_bound', 'upper_bound',
+            'std::map', 'std::unordered_map'
+        ],
+    }
+    
+    # Header-specific std:: patterns
+    STD_USAGE_PATTERNS = {
+        'iostream': [r'std::\b(cout|cin|cerr|clog|wcout|wcin|wcerr|wclog|endl|getline)\b'],
+        'fstream': [r'std::\b(ifstream|ofstream|fstream)\b'],
+        'sstream': [r'std::\b(stringstream|istringstream|ostringstream)\b'],
+        'iomanip': [r'std::\b(setw|setprecision|fixed|scientific|left|right|setfill)\b'],
+        'vector': [r'std::vector\s*<', r'\.push_back\(', r'\.emplace_back\('],
+        'map': [r'std::map\s*<', r'\.insert\(', r'\.find\('],
+        'set': [r'std::set\s*<', r'\.insert\(', r'\.find\('],
+        'string': [r'std::string\b', r'std::to_string\('],
+        'array': [r'std::array\s*<'],
+        'algorithm': [
+            r'std::\b(sort|find|transform|copy|unique|reverse|rotate|for_each)\b',
+            r'std::\b(any_of|all_of|none_of|count|remove|partition)\b'
+        ],
+        'numeric': [r'std::\b(accumulate|inner_product|partial_sum|adjacent_difference)\b'],
+        'memory': [r'std::\b(make_shared|make_unique|shared_ptr|unique_ptr|weak_ptr)\b'],
+        'regex': [r'std::\b(regex|smatch|regex_match|regex_search|regex_replace)\b'],
+        'exception': [r'std::exception\b'],
+        'thread': [r'std::thread\b'],
+        'mutex': [r'std::\b(mutex|lock_guard|unique_lock)\b'],
+        'chrono': [r'std::chrono::\b', r'std::\b(duration|time_point)\b'],
+    }
+    
+    # Usage-check patterns, compiled once per process
+    # (bytes patterns: sources are stripped before being decoded)
+    _LINE_COMMENT_RE = re.compile(rb'//.*?$', re.MULTILINE)
+    _BLOCK_COMMENT_RE = re.compile(rb'/\*.*?\*/', re.DOTALL)
+    _STRING_RE = re.compile(rb'"[^"]*"')
+    _CHAR_RE = re.compile(rb"'[^']*'")
+    _INCLUDE_RE = re.compile(rb'#include.*')
+    
+    _WORD_RE = re.compile(r'\w+')
+    
+    # Substrings (of the lowercased header) marking 3rd-party libraries
+    THIRD_PARTY_MARKERS = (
+        'boost/', 'boost\\', 'opencv', 'qt', 'nlohmann', 'glm', 'eigen',
+        'tensorflow', 'pytorch'
+    )
+    
+    # Plain symbols are checked against a file's identifier set; qualified
+    # ones (std::map, chrono::now) span several tokens and need a regex
+    _SYMBOL_IDENTIFIERS = {
+        base: frozenset(sym for sym in symbols if '::' not in sym)
+        for base, symbols in HEADER_SYMBOLS.items()
+    }
+    _QUALIFIED_SYMBOL_PATTERNS = {
+        base: re.compile(r'\b(?:' + '|'.join(
+            re.escape(sym) for sym in symbols if '::' in sym
+        ) + r')\b')
+        for base, symbols in HEADER_SYMBOLS.items()
+        if any('::' in sym for sym in symbols)
+    }
+    _STD_USAGE_RES = {
+        base: re.compile('|'.join(f'(?:{p})' for p in patterns))
+        for base, patterns in STD_USAGE_PATTERNS.items()
+    }
+    
     def __init__(self, graph: DependencyGraph):
         """
         Initialize estimator.
@@ -98,7 +377,21 @@ class CostEstimator:
             graph: Dependency graph to analyze
         """
         self.graph = graph
-        self._cache: Dict[str, float] = {}  # Cache computed costs
+        # Cache computed costs, keyed by (header, analysed header path)
+        self._cache: Dict[Tuple[str, str], float] = {}
+        # Costs of headers without a FileAnalysis, keyed by header
+        self._pure_cache: Dict[str, float] = {}
+        self._base_cost_cache: Dict[str, float] = {}
+        self._transitive_cache: Dict[str, float] = {}
+        # Stripped source per file: path -> ((mtime_ns, size), content)
+        self._stripped_content_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        # Identifiers per file: path -> (stripped content, identifiers, lowercased)
+        self._identifier_cache: Dict[str, Tuple[str, FrozenSet[str], FrozenSet[str]]] = {}
+        # Per-header classification: header -> (is_system, is_3rd_party,
+        # base name, lowercased base name if it is a plain word)
+        self._header_info_cache: Dict[str, Tuple[bool, bool, str, Optional[str]]] = {}
+        # Matching EXPENSIVE_HEADERS key per header (None if not expensive)
+        self._expensive_key_cache: Dict[str, Optional[str]] = {}
     
     def estimate_header_cost(self, 
                             header: str, 
@@ -113,48 +406,81 @@ class CostEstimator:
         Returns:
             Cost score (higher = more expensive)
         """
+        # Without a FileAnalysis the cost depends on the header alone
+        if analysis is None:
+            return self._pure_header_cost(header)
+        
         # Check cache
-        cache_key = f"{header}:{analysis.filepath if analysis else 'none'}"
+        cache_key = (header, analysis.filepath)
         if cache_key in self._cache:
             return self._cache[cache_key]
         
-        cost = 0.0
-        
         # Component 1: Base cost from known expensive headers
-        base_cost = self._get_base_cost(header)
-        cost += base_cost
-        
-        # Component 2: File size analysis (if we have the file)
-        if analysis:
-            # Lines of code contribute to compile time
-            # Rule of thumb: Each line adds ~0.5 cost units
-            cost += analysis.total_lines * 0.5
-            
-            # Templates significantly increase compile time
-            if analysis.has_templates:
-                cost *= self.TEMPLATE_MULTIPLIER
-                # Add extra cost for each template
-                template_count = header.count('template')
-                cost += template_count * 200
-            
-            # Macros increase preprocessing time
-            if analysis.has_macros:
-                cost *= self.MACRO_MULTIPLIER
-            
-            # Classes add complexity
-            cost += analysis.class_count * 50
-            
-            # Namespaces are generally lightweight but add some overhead
-            cost += analysis.namespace_count * 10
+        # Component 2: File size analysis
+        cost = self._apply_analysis(self._get_base_cost(header), header, analysis)
         
         # Component 3: Transitive dependency cost
-        transitive_cost = self._estimate_transitive_cost(header)
-        cost += transitive_cost
+        cost += self._estimate_transitive_cost(header)
         
         # Cache and return
         self._cache[cache_key] = cost
         return cost
     
+    def _pure_header_cost(self, header: str) -> float:
+        """
+        Estimate cost of a header we have no FileAnalysis for.
+        
+        Args:
+            header: Header name or path
+            
+        Returns:
+            Base cost plus transitive dependency cost
+        """
+        if header in self._pure_cache:
+            return self._pure_cache[header]
+        
+        cost = self._get_base_cost(header) + self._estimate_transitive_cost(header)
+        self._pure_cache[header] = cost
+        return cost
+    
+    def _apply_analysis(self, 
+                        cost: float, 
+                        header: str, 
+                        analysis: FileAnalysis) -> float:
+        """
+        Adjust a base cost using the analysed contents of the header.
+        
+        Args:
+            cost: Base cost of the header
+            header: Header name or path
+            analysis: FileAnalysis for the header
+            
+        Returns:
+            Cost including file size, template, macro and class components
+        """
+        # Lines of code contribute to compile time
+        # Rule of thumb: Each line adds ~0.5 cost units
+        cost += analysis.total_lines * 0.5
+        
+        # Templates significantly increase compile time
+        if analysis.has_templates:
+            cost *= self.TEMPLATE_MULTIPLIER
+            # Add extra cost for each template
+            template_count = header.count('template')
+            cost += template_count * 200
+        
+        # Macros increase preprocessing time
+        if analysis.has_macros:
+            cost *= self.MACRO_MULTIPLIER
+        
+        # Classes add complexity
+        cost += analysis.class_count * 50
+        
+        # Namespaces are generally lightweight but add some overhead
+        cost += analysis.namespace_count * 10
+        
+        return cost
+    
     def _get_base_cost(self, header: str) -> float:
         """
         Get base cost from known expensive headers.
@@ -165,21 +491,40 @@ class CostEstimator:
         Returns:
             Base cost value
         """
-        # Normalize header name
-        header_lower = header.lower()
-        
-        # Check for exact matches first
-        for known_header, cost in self.EXPENSIVE_HEADERS.items():
-            if known_header in header_lower:
-                return cost
-        
-        # Default costs based on header type
-        if header.startswith('<') or '/' not in header:
+        if header in self._base_cost_cache:
+            return self._base_cost_cache[header]
+        
+        # Check for known expensive headers first
+        expensive_key = self._expensive_key(header)
+        if expensive_key is not None:
+            cost = self.EXPENSIVE_HEADERS[expensive_key]
+        elif header.startswith('<') or '/' not in header:
             # System header
-            return 300
+            cost = 300
         else:
             # User header
-            return 150
+            cost = 150
+        
+        self._base_cost_cache[header] = cost
+        return cost
+    
+    def _expensive_key(self, header: str) -> Optional[str]:
+        """
+        Find the known expensive header entry matching a header.
+        
+        Args:
+            header: Header name
+            
+        Returns:
+            Matching EXPENSIVE_HEADERS key, or None
+        """
+        if header in self._expensive_key_cache:
+            return self._expensive_key_cache[header]
+        
+        match = self._EXPENSIVE_RE.search(header.lower())
+        key = match.group() if match else None
+        self._expensive_key_cache[header] = key
+        return key
     
     def _estimate_transitive_cost(self, header: str) -> float:
         """
@@ -194,6 +539,10 @@ class CostEstimator:
         Returns:
             Estimated transitive cost
         """
+        # Popular headers are included by many files; walk the graph once each
+        if header in self._transitive_cache:
+            return self._transitive_cache[header]
+        
         # Get dependency depth (how many levels deep)
         depth = self.graph.get_dependency_depth(header)
         
@@ -211,6 +560,7 @@ class CostEstimator:
         if depth > 5:
             cost += (depth - 5) * 200
         
+        self._transitive_cache[header] = cost
         return cost
     
     def check_header_usage(self, 
@@ -231,40 +581,35 @@ class CostEstimator:
         Returns:
             (is_likely_used, confidence)
         """
-        try:
-            content = Path(source_file).read_text(encoding='utf-8', errors='ignore')
-        except Exception:
+        content = self._get_stripped_content(source_file)
+        if content is None:
             return (True, 0.0)  # Assume used if can't read
+        identifiers, identifiers_lower = self._get_identifiers(source_file, content)
         
-        # Better preprocessing: remove comments and strings
-        original_content = content
-        content = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
-        content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-        content = re.sub(r'"[^"]*"', '""', content)
-        content = re.sub(r"'[^']*'", "''", content)
-        content = re.sub(r'#include.*', '', content)
-        
-        # Classify header type
-        is_system = header.startswith('<') or '/' not in header
+        # Classify header type and extract base name
+        is_system, is_3rd_party, base_name, base_name_lower = (
+            self._classify_header(header)
+        )
         is_boost = 'boost' in header
-        is_3rd_party = any(x in header.lower() for x in ['boost/', 'boost\\', 'opencv', 'qt', 'nlohmann', 'glm', 'eigen', 'tensorflow', 'pytorch'])
         is_local = not is_system and not is_3rd_party
         
-        # Extract base name
-        base_name = Path(header).stem
-        
         # Apply detection
         patterns_found = 0
         total_patterns = 0
         
         # Pattern 1: Direct name usage
         total_patterns += 1
-        if re.search(rf'\b{re.escape(base_name)}\b', content, re.IGNORECASE):
+        if base_name_lower is not None:
+            # A whole word: same as a case-insensitive \b...\b search
+            name_used = base_name_lower in identifiers_lower
+        else:
+            name_used = re.search(rf'\b{re.escape(base_name)}\b', content, re.IGNORECASE)
+        if name_used:
             patterns_found += 1
         
         # Pattern 2: Symbol usage (from expanded dictionary)
         total_patterns += 1
-        if self._check_symbol_usage(header, content):
+        if self._check_symbol_usage(header, content, identifiers):
             patterns_found += 1
         
         # Pattern 3: Header-SPECIFIC std:: usage (FIXED: was checking all std::)
@@ -318,229 +663,115 @@ class CostEstimator:
         
         return (is_likely_used, confidence)
     
-    def _check_symbol_usage(self, header: str, content: str) -> bool:
-        """Check for usage of common symbols from header (with word boundaries)"""
-        # EXPANDED SYMBOL DICTIONARY (Fix #2: Better coverage)
-        # Now includes 95% of common usage patterns for each header
-        header_symbols = {
-            # I/O Streams
-            'iostream': [
-                'cout', 'cin', 'cerr', 'clog',
-                'wcout', 'wcin', 'wcerr', 'wclog',
-                'endl', 'ends', 'flush',
-                'ostream', 'istream', 'ios', 'getline'
-            ],
-            'fstream': [
-                'ifstream', 'ofstream', 'fstream',
-                'open', 'close', 'is_open', 'eof'
-            ],
-            'sstream': [
-                'stringstream', 'istringstream', 'ostringstream',
-                'str', 'rdbuf'
-            ],
-            'iomanip': [
-                'setw', 'setprecision', 'fixed', 'scientific',
-                'left', 'right', 'internal', 'setfill'
-            ],
-            
-            # Containers
-            'vector': [
-                'push_back', 'emplace_back', 'pop_back', 'resize',
-                'reserve', 'capacity', 'clear', 'begin', 'end',
-                'at', 'front', 'back', 'size', 'empty'
-            ],
-            'map': [
-                'insert', 'find', 'erase', 'count', 'at',
-                'begin', 'end', 'clear', 'empty', 'size',
-                'lower_bound', 'upper_bound'
-            ],
-            'unordered_map': [
-                'insert', 'find', 'erase', 'count', 'at',
-                'bucket', 'hash', 'reserve'
-            ],
-            'set': [
-                'insert', 'find', 'erase', 'count',
-                'lower_bound', 'upper_bound', 'equal_range'
-            ],
-            'deque': [
-                'push_back', 'push_front', 'pop_back', 'pop_front',
-                'resize', 'begin', 'end'
-            ],
-            'list': [
-                'push_back', 'push_front', 'pop_back', 'pop_front',
-                'insert', 'erase', 'reverse', 'sort'
-            ],
-            'queue': ['push', 'pop', 'front', 'back', 'empty', 'size'],
-            'stack': ['push', 'pop', 'top', 'empty', 'size'],
-            'array': ['at', 'fill', 'begin', 'end', 'size'],
-            
-            # Strings
-            'string': [
-                'substr', 'append', 'to_string', 'getline',
-                'find', 'replace', 'c_str', 'length', 'size',
-                'empty', 'clear', 'compare'
-            ],
-            
-            # Algorithms - CRITICAL FIX #2: Better symbol coverage
-            # Include both non-std and std:: prefixed versions
-            'algorithm': [
-                # Sort variants
-                'sort', 'stable_sort', 'partial_sort', 'nth_element',
-                'std::sort', 'std::stable_sort', 'std::partial_sort',
-                
-                # Find/Search
-                'find', 'find_if', 'find_if_not', 'find_first_of',
-                'std::find', 'std::find_if', 'std::find_if_not',
-                
-                # Transform/For Each
-                'transform', 'for_each', 'for_each_n',
-                'std::transform', 'std::for_each',
-                
-                # Count
-                'count', 'count_if',
-                'std::count', 'std::count_if',
-                
-                # Copy/Move
-                'copy', 'copy_if', 'copy_n', 'copy_backward',
-                'move', 'move_backward',
-                'std::copy', 'std::copy_if', 'std::move',
-                
-                # Unique/Remove
-                'unique', 'unique_copy', 'remove', 'remove_if',
-                'std::unique', 'std::remove', 'std::remove_if',
-                
-                # Reverse/Rotate
-                'reverse', 'reverse_copy', 'rotate', 'rotate_copy',
-                'std::reverse', 'std::rotate',
-                
-                # shuffling
-                'shuffle', 'random_shuffle',
-                'std::shuffle',
-                
-                # Binary search
-                'binary_search', 'lower_bound', 'upper_bound', 'equal_range',
-                'std::binary_search', 'std::lower_bound', 'std::upper_bound',
-                
-                # Min/Max
-                'min_element', 'max_element', 'minmax_element',
-                'std::min_element', 'std::max_element',
-                
-                # Set operations
-                'merge', 'inplace_merge',
-                'includes', 'set_union', 'set_intersection', 'set_difference',
-                'std::merge', 'std::set_union', 'std::set_intersection',
-                
-                # Predicates
-                'is_sorted', 'is_sorted_until',
-                'is_permutation', 'next_permutation', 'prev_permutation',
-                'std::is_sorted', 'std::is_permutation',
-                
-                # Fill/Generate
-                'fill', 'fill_n', 'generate', 'generate_n',
-                'std::fill', 'std::generate',
-                
-                # Predicates for algorithms
-                'all_of', 'any_of', 'none_of',
-                'std::all_of', 'std::any_of', 'std::none_of',
-                
-                # Partition
-                'partition', 'stable_partition',
-                'std::partition', 'std::stable_partition',
-            ],
-            'numeric': [
-                'accumulate', 'inner_product', 'partial_sum',
-                'adjacent_difference'
-            ],
-            
-            # Memory Management
-            'memory': [
-                'make_shared', 'make_unique',
-                'shared_ptr', 'unique_ptr', 'weak_ptr',
-                'get', 'reset', 'release'
-            ],
-            
-            # Threading
-            'thread': [
-                'join', 'detach', 'joinable', 'hardware_concurrency',
-                'get_id', 'sleep_for'
-            ],
-            'mutex': [
-                'lock', 'unlock', 'try_lock',
-                'lock_guard', 'unique_lock', 'scoped_lock'
-            ],
-            'condition_variable': [
-                'notify_one', 'notify_all', 'wait', 'wait_for'
-            ],
-            'future': [
-                'async', 'future', 'promise', 'get', 'valid',
-                'wait', 'wait_for'
-            ],
-            
-            # Exceptions
-            'stdexcept': [
-                'exception', 'runtime_error', 'logic_error',
-                'invalid_argument', 'out_of_range', 'what'
-            ],
-            
-            # Utilities
-            'functional': [
-                'function', 'bind', 'ref', 'cref',
-                'less', 'greater', 'equal_to'
-            ],
-            'utility': [
-                'pair', 'make_pair', 'tuple', 'make_tuple',
-                'move', 'forward', 'swap'
-            ],
-            'chrono': [
-                'duration', 'time_point', 'chrono::now',
-                'steady_clock', 'system_clock'
-            ],
-            'random': [
-                'mt19937', 'random_device', 'uniform_int_distribution',
-                'uniform_real_distribution', 'normal_distribution'
-            ],
-            
-            # Type information
-            'typeinfo': ['typeid', 'type_info'],
-            'type_traits': [
-                'is_same', 'is_integral', 'is_floating_point',
-                'enable_if', 'decay', 'remove_reference'
-            ],
+    def _classify_header(self, header: str) -> Tuple[bool, bool, str, Optional[str]]:
+        """
+        Classify a header for usage checks, lowercasing it only once.
+        
+        Args:
+            header: Header name
             
-            # Regex (very expensive, often unused)
-            'regex': [
-                'regex', 'smatch', 'regex_match', 'regex_search',
-                'regex_replace', 'regex_iterator', 'sregex_iterator',
-                'std::regex', 'std::smatch', 'std::regex_match'
-            ],
+        Returns:
+            (is_system, is_3rd_party, base_name, base_name_lower), where
+            base_name_lower is None unless the base name is a plain word
+        """
+        info = self._header_info_cache.get(header)
+        if info is None:
+            header_lower = header.lower()
+            base_name = Path(header).stem
+            info = (
+                header.startswith('<') or '/' not in header,
+                any(m in header_lower for m in self.THIRD_PARTY_MARKERS),
+                base_name,
+                base_name.lower() if self._WORD_RE.fullmatch(base_name) else None,
+            )
+            self._header_info_cache[header] = info
+        return info
+    
+    def _get_stripped_content(self, source_file: str) -> Optional[str]:
+        """
+        Read a source file with comments, strings and includes removed.
+        
+        The result is cached per file (invalidated when its mtime or size
+        changes), so checking every include of a file reads and strips it once.
+        
+        Args:
+            source_file: Path to source file
             
-            # Exception handling
-            'exception': [
-                'exception', 'what', 'bad_exception',
-                'std::exception', 'throw', 'try', 'catch'
-            ],
+        Returns:
+            Stripped content, or None if the file can't be read
+        """
+        try:
+            stat = os.stat(source_file)
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = self._stripped_content_cache.get(source_file)
+            if cached is not None and cached[0] == version:
+                return cached[1]
             
-            # Map variants
-            'map': [
-                'insert', 'find', 'erase', 'count', 'at',
-                'begin', 'end', 'clear', 'empty', 'size',
-                'lower_bound', 'upper_bound',
-                'std::map', 'std::unordered_map'
-            ],
-        }
+            # Strip the mapped bytes directly; only the (smaller) result is
+            # copied and decoded. ASCII-only patterns are safe on UTF-8.
+            with open(source_file, 'rb') as f:
+                if stat.st_size == 0:
+                    data = b''
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        data = self._LINE_COMMENT_RE.sub(b'', mm)
+        except Exception:
+            return None
         
+        # Better preprocessing: remove comments and strings
+        data = self._BLOCK_COMMENT_RE.sub(b'', data)
+        data = self._STRING_RE.sub(b'""', data)
+        data = self._CHAR_RE.sub(b"''", data)
+        data = self._INCLUDE_RE.sub(b'', data)
+        content = data.decode('utf-8', errors='ignore')
+        
+        self._stripped_content_cache[source_file] = (version, content)
+        return content
+    
+    def _get_identifiers(self,
+                         source_file: str,
+                         content: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Get the set of words in a file's stripped content.
+        
+        Cached alongside the stripped content it was built from, so each
+        file is tokenized once no matter how many includes it has.
+        
+        Args:
+            source_file: Path to source file
+            content: Stripped content of the file
+            
+        Returns:
+            (identifiers, lowercased identifiers)
+        """
+        cached = self._identifier_cache.get(source_file)
+        if cached is not None and cached[0] is content:
+            return cached[1], cached[2]
+        
+        identifiers = frozenset(self._WORD_RE.findall(content))
+        identifiers_lower = frozenset(i.lower() for i in identifiers)
+        self._identifier_cache[source_file] = (content, identifiers, identifiers_lower)
+        return identifiers, identifiers_lower
+    
+    def _check_symbol_usage(self,
+                            header: str,
+                            content: str,
+                            identifiers: Optional[FrozenSet[str]] = None) -> bool:
+        """Check for usage of common symbols from header (with word boundaries)"""
         # Extract base name from header (e.g., "iostream" from "<iostream>" or "iostream")
         header_base = Path(header.strip('<>\"')).stem
         
-        # Get symbols for this header
-        if header_base in header_symbols:
-            symbols = header_symbols[header_base]
-            # Use word boundaries for accurate detection
-            for symbol in symbols:
-                if re.search(rf'\b{re.escape(symbol)}\b', content):
-                    return True
+        symbols = self._SYMBOL_IDENTIFIERS.get(header_base)
+        if symbols is None:
+            return False
+        
+        if identifiers is None:
+            identifiers = frozenset(self._WORD_RE.findall(content))
+        if not symbols.isdisjoint(identifiers):
+            return True
         
-        return False
+        qualified = self._QUALIFIED_SYMBOL_PATTERNS.get(header_base)
+        return bool(qualified and qualified.search(content))
     
     def _check_header_specific_std_usage(self, header: str, content: str) -> bool:
         """
@@ -557,39 +788,9 @@ class CostEstimator:
         """
         header_base = Path(header.strip('<>\"')).stem
         
-        # Header-specific std:: patterns
-        std_patterns = {
-            'iostream': [r'std::\b(cout|cin|cerr|clog|wcout|wcin|wcerr|wclog|endl|getline)\b'],
-            'fstream': [r'std::\b(ifstream|ofstream|fstream)\b'],
-            'sstream': [r'std::\b(stringstream|istringstream|ostringstream)\b'],
-            'iomanip': [r'std::\b(setw|setprecision|fixed|scientific|left|right|setfill)\b'],
-            'vector': [r'std::vector\s*<', r'\.push_back\(', r'\.emplace_back\('],
-            'map': [r'std::map\s*<', r'\.insert\(', r'\.find\('],
-            'set': [r'std::set\s*<', r'\.insert\(', r'\.find\('],
-            'string': [r'std::string\b', r'std::to_string\('],
-            'array': [r'std::array\s*<'],
-            'algorithm': [
-                r'std::\b(sort|find|transform|copy|unique|reverse|rotate|for_each)\b',
-                r'std::\b(any_of|all_of|none_of|count|remove|partition)\b'
-            ],
-            'numeric': [r'std::\b(accumulate|inner_product|partial_sum|adjacent_difference)\b'],
-            'memory': [r'std::\b(make_shared|make_unique|shared_ptr|unique_ptr|weak_ptr)\b'],
-            'regex': [r'std::\b(regex|smatch|regex_match|regex_search|regex_replace)\b'],
-            'exception': [r'std::exception\b'],
-            'thread': [r'std::thread\b'],
-            'mutex': [r'std::\b(mutex|lock_guard|unique_lock)\b'],
-            'chrono': [r'std::chrono::\b', r'std::\b(duration|time_point)\b'],
-        }
-        
         # Check if this header has specific patterns
-        if header_base in std_patterns:
-            patterns = std_patterns[header_base]
-            for pattern in patterns:
-                if re.search(pattern, content):
-                    return True
-        
-        # Default: no specific std:: usage found for this header
-        return False
+        pattern = self._STD_USAGE_RES.get(header_base)
+        return bool(pattern and pattern.search(content))
     
     def analyze_file_costs(self, 
                           analysis: FileAnalysis,
@@ -635,7 +836,7 @@ class CostEstimator:
             })
         
         # Sort by cost (highest first)
-        results.sort(key=lambda x: x['estimated_cost'], reverse=True)
+        results.sort(key=itemgetter('estimated_cost'), reverse=True)
         
         return results
     
@@ -655,8 +856,7 @@ class CostEstimator:
         confidence = 0.5  # Base confidence
         
         # Higher confidence for known expensive headers
-        if any(known in inc.header.lower() 
-               for known in self.EXPENSIVE_HEADERS.keys()):
+        if self._expensive_key(inc.header) is not None:
             confidence += 0.3
         
         # Higher confidence if we analyzed the actual file
@@ -684,20 +884,18 @@ class CostEstimator:
         """
         costs = self.analyze_file_costs(analysis, all_analyses)
         
-        total_cost = sum(c['estimated_cost'] for c in costs)
-        unused_cost = sum(
-            c['estimated_cost'] for c in costs 
-            if not c['likely_used']
-        )
-        
-        # Find optimization opportunities (expensive + unused)
-        opportunities = [
-            c for c in costs 
-            if not c['likely_used'] and c['estimated_cost'] > 500
-        ]
-        
-        # Sort opportunities by cost
-        opportunities.sort(key=lambda x: x['estimated_cost'], reverse=True)
+        # Single pass: totals plus optimization opportunities (expensive + unused).
+        # costs is sorted by cost, so opportunities come out sorted as well.
+        total_cost = 0.0
+        unused_cost = 0.0
+        opportunities = []
+        for c in costs:
+            cost = c['estimated_cost']
+            total_cost += cost
+            if not c['likely_used']:
+                unused_cost += cost
+                if cost > 500:
+                    opportunities.append(c)
         
         # Calculate potential savings
         potential_savings_pct = (
@@ -721,6 +919,44 @@ class CostEstimator:
             }
         }
     
+    def generate_reports(self,
+                         analyses: List[FileAnalysis],
+                         all_analyses: Dict[str, FileAnalysis],
+                         max_workers: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Generate cost reports for several files, in parallel processes when
+        there are many.
+        
+        Each report depends only on its file, the graph and all_analyses, so
+        files are independent. Workers receive the estimator and analyses
+        once, then only file indices.
+        
+        Args:
+            analyses: FileAnalysis objects to report on
+            all_analyses: Dict of all analyses
+            max_workers: Processes to use (default: CPU count)
+            
+        Yields:
+            Report dictionaries, in the same order as ``analyses``
+        """
+        done = 0
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and len(analyses) >= PARALLEL_REPORT_THRESHOLD:
+            chunksize = max(1, len(analyses) // (workers * 4))
+            try:
+                with ProcessPoolExecutor(max_workers=workers,
+                                         initializer=_init_report_worker,
+                                         initargs=(self, analyses, all_analyses)) as executor:
+                    for report in executor.map(_report_worker, range(len(analyses)),
+                                               chunksize=chunksize):
+                        yield report
+                        done += 1
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                pass  # No usable process pool here; finish in-process instead
+        
+        for analysis in analyses[done:]:
+            yield self.generate_report(analysis, all_analyses)
+    
     def generate_project_summary(self, reports: List[Dict]) -> Dict:
         """
         Generate summary statistics for entire project.
@@ -731,31 +967,39 @@ class CostEstimator:
         Returns:
             Summary dictionary
         """
-        total_cost = sum(r['total_estimated_cost'] for r in reports)
-        total_waste = sum(r['wasted_cost'] for r in reports)
+        total_cost = 0.0
+        total_waste = 0.0
+        total_includes = 0
         total_files = len(reports)
-        total_includes = sum(r['total_includes'] for r in reports)
-        
-        # Find files with most waste
-        files_by_waste = sorted(
-            reports,
-            key=lambda r: r['wasted_cost'],
-            reverse=True
-        )
         
-        # Collect all optimization opportunities
-        all_opportunities = []
         for report in reports:
-            for opp in report['optimization_opportunities']:
-                all_opportunities.append({
-                    'file': Path(report['file']).name,
-                    'full_path': report['file'],
-                    'header': opp['header'],
-                    'cost': opp['estimated_cost'],
-                    'line': opp['line']
-                })
-        
-        all_opportunities.sort(key=lambda x: x['cost'], reverse=True)
+            total_cost += report['total_estimated_cost']
+            total_waste += report['wasted_cost']
+            total_includes += report['total_includes']
+        
+        # Only the top entries are reported, so select them rather than
+        # sorting everything (same order as sorted(..., reverse=True)[:n])
+        files_by_waste = heapq.nlargest(10, reports, key=itemgetter('wasted_cost'))
+        
+        # Rank (report, opportunity) pairs straight from the reports and only
+        # build output records for the winners
+        top_pairs = heapq.nlargest(
+            20,
+            ((report, opp)
+             for report in reports
+             for opp in report['optimization_opportunities']),
+            key=lambda pair: pair[1]['estimated_cost']
+        )
+        top_opportunities = [
+            {
+                'file': Path(report['file']).name,
+                'full_path': report['file'],
+                'header': opp['header'],
+                'cost': opp['estimated_cost'],
+                'line': opp['line']
+            }
+            for report, opp in top_pairs
+        ]
         
         return {
             'total_files': total_files,
@@ -764,6 +1008,24 @@ class CostEstimator:
             'total_waste': round(total_waste, 1),
             'waste_percentage': round(total_waste / total_cost * 100, 1) if total_cost > 0 else 0,
             'avg_cost_per_file': round(total_cost / total_files, 1) if total_files > 0 else 0,
-            'top_wasteful_files': files_by_waste[:10],
-            'top_opportunities': all_opportunities[:20],
+            'top_wasteful_files': files_by_waste,
+            'top_opportunities': top_opportunities,
         }
+
+
+# Per-process state for report workers: (estimator, analyses, all_analyses)
+_worker_state: Optional[Tuple[CostEstimator, List[FileAnalysis], Dict[str, FileAnalysis]]] = None
+
+
+def _init_report_worker(estimator: CostEstimator,
+                        analyses: List[FileAnalysis],
+                        all_analyses: Dict[str, FileAnalysis]):
+    """Install the estimator and analyses a worker process reports on"""
+    global _worker_state
+    _worker_state = (estimator, analyses, all_analyses)
+
+
+def _report_worker(index: int) -> Dict:
+    """Generate the report for one file in a worker process"""
+    estimator, analyses, all_analyses = _worker_state
+    return estimator.generate_report(analyses[index], all_analyses)
@@ -2,11 +2,39 @@
 Forward Declaration Detector - Find opportunities to replace includes with forward declarations
 """
 import re
-from typing import List, Dict, Set, Tuple
+from collections import Counter
+from typing import Iterator, List, Dict, Optional, Pattern, Set, Tuple
 from pathlib import Path
 from .parser import FileAnalysis, Include
 
 
+# Patterns that indicate pointer/reference-only usage (forward declaration OK),
+# each paired with a substring it cannot match without (None: no cheap test)
+POINTER_PATTERNS: Tuple[Tuple[Optional[str], Pattern], ...] = (
+    ('*', re.compile(r'\b(\w+)\s*\*')),                     # Type* ptr
+    ('&', re.compile(r'\b(\w+)\s*&')),                      # Type& ref
+    ('*', re.compile(r'<\s*(\w+)\s*\*\s*>')),               # vector<Type*>
+    ('unique_ptr', re.compile(r'unique_ptr\s*<\s*(\w+)')),  # unique_ptr<Type>
+    ('shared_ptr', re.compile(r'shared_ptr\s*<\s*(\w+)')),  # shared_ptr<Type>
+    ('weak_ptr', re.compile(r'weak_ptr\s*<\s*(\w+)')),      # weak_ptr<Type>
+)
+
+# Patterns that indicate full definition needed (forward declaration NOT OK)
+DEFINITION_PATTERNS: Tuple[Tuple[Optional[str], Pattern], ...] = (
+    (';', re.compile(r'\b(\w+)\s+\w+\s*;')),                # Type var; (object on stack)
+    ('sizeof', re.compile(r'sizeof\s*\(\s*(\w+)')),         # sizeof(Type)
+    ('new', re.compile(r'new\s+(\w+)\s*[\(\{]')),           # new Type() or new Type{}
+    (None, re.compile(r'\b(\w+)\s+\w+\s*[\(\{]')),          # Type obj(args) or Type obj{args}
+)
+
+# Comments and string/char literals (with escapes), matched in one left-to-right
+# pass so a '//' inside a string or a quote inside a comment is not misread
+COMMENT_STRING_PATTERN = re.compile(
+    r'//[^\n]*|/\*.*?\*/|"[^"\\\n]*(?:\\.[^"\\\n]*)*"|\'[^\'\\\n]*(?:\\.[^\'\\\n]*)*\'',
+    re.DOTALL
+)
+
+
 class ForwardDeclarationDetector:
     """
     Detects when headers can be replaced with forward declarations.
@@ -17,23 +45,16 @@ class ForwardDeclarationDetector:
     """
     
     def __init__(self):
-        # Patterns that indicate pointer/reference-only usage (forward declaration OK)
-        self.pointer_patterns = [
-            re.compile(r'\b(\w+)\s*\*'),           # Type* ptr
-            re.compile(r'\b(\w+)\s*&'),            # Type& ref
-            re.compile(r'<\s*(\w+)\s*\*\s*>'),     # vector<Type*>
-            re.compile(r'unique_ptr\s*<\s*(\w+)'), # unique_ptr<Type>
-            re.compile(r'shared_ptr\s*<\s*(\w+)'), # shared_ptr<Type>
-            re.compile(r'weak_ptr\s*<\s*(\w+)'),   # weak_ptr<Type>
-        ]
-        
-        # Patterns that indicate full definition needed (forward declaration NOT OK)
-        self.definition_patterns = [
-            re.compile(r'\b(\w+)\s+\w+\s*;'),      # Type var; (object on stack)
-            re.compile(r'sizeof\s*\(\s*(\w+)'),    # sizeof(Type)
-            re.compile(r'new\s+(\w+)\s*[\(\{]'),   # new Type() or new Type{}
-            re.compile(r'\b(\w+)\s+\w+\s*[\(\{]'), # Type obj(args) or Type obj{args}
-        ]
+        self.pointer_patterns = POINTER_PATTERNS
+        self.definition_patterns = DEFINITION_PATTERNS
+        self._class_name_cache: Dict[str, str] = {}
+    
+    @staticmethod
+    def _applicable(patterns: Tuple[Tuple[Optional[str], Pattern], ...], content: str) -> Iterator[Pattern]:
+        """Yield the patterns whose trigger substring occurs in content"""
+        for trigger, pattern in patterns:
+            if trigger is None or trigger in content:
+                yield pattern
     
     def analyze_file(self, filepath: str, analysis: FileAnalysis) -> List[Dict]:
         """
@@ -51,10 +72,16 @@ class ForwardDeclarationDetector:
         except:
             return []
         
-        # Remove comments and strings to avoid false positives
-        content = self._remove_comments_and_strings(content)
+        # Comments and strings are stripped on first use: stripping only
+        # removes text, so a class name missing from the raw file is missing
+        # from the stripped one too, and files with no candidates skip it
+        stripped = False
         
         opportunities = []
+        # Names captured by each pattern group, scanned once per file on
+        # first use and shared by every include
+        pointer_hits = None
+        definition_hits = None
         
         for inc in analysis.includes:
             # Skip system includes (can't forward declare STL classes)
@@ -74,12 +101,28 @@ class ForwardDeclarationDetector:
             if class_name not in content:
                 continue
             
+            if not stripped:
+                # Remove comments and strings to avoid false positives
+                content = self._remove_comments_and_strings(content)
+                stripped = True
+                if class_name not in content:
+                    continue
+            
+            if pointer_hits is None:
+                pointer_hits = self._count_captures(self.pointer_patterns, content)
+                definition_hits = self._count_captures(self.definition_patterns, content)
+            
             # Check usage patterns
-            is_pointer_only = self._check_pointer_only_usage(content, class_name)
-            needs_definition = self._check_needs_definition(content, class_name)
+            pointer_count = self._count_mentions(pointer_hits, class_name)
+            definition_count = self._count_mentions(definition_hits, class_name)
+            is_pointer_only = pointer_count > 0
+            needs_definition = (definition_count > 0 and
+                                re.search(rf'\b{class_name}\b', content) is not None)
             
             if is_pointer_only and not needs_definition:
-                confidence = self._calculate_confidence(content, class_name)
+                confidence = self._calculate_confidence(
+                    content, class_name, pointer_count, definition_count
+                )
                 
                 # Only suggest if confidence is reasonable
                 if confidence >= 0.5:
@@ -95,6 +138,14 @@ class ForwardDeclarationDetector:
     
     def _extract_class_name(self, header: str) -> str:
         """Extract likely class name from header filename"""
+        name = self._class_name_cache.get(header)
+        if name is None:
+            name = self._class_name_cache[header] = self._class_name_from_header(header)
+        return name
+    
+    @staticmethod
+    def _class_name_from_header(header: str) -> str:
+        """Derive a PascalCase class name from a header filename"""
         # Remove path and extension
         name = Path(header).stem
         
@@ -111,48 +162,32 @@ class ForwardDeclarationDetector:
         
         return name
     
-    def _check_pointer_only_usage(self, content: str, class_name: str) -> bool:
-        """Check if class is only used as pointer/reference"""
-        for pattern in self.pointer_patterns:
-            matches = pattern.findall(content)
-            # Check if our class name is in the matches
-            if any(class_name == match or class_name in match for match in matches):
-                return True
-        return False
+    def _count_captures(self,
+                        patterns: List[Tuple[Optional[str], Pattern]],
+                        content: str) -> Counter:
+        """Count the names captured by a group of patterns across the file"""
+        hits = Counter()
+        for pattern in self._applicable(patterns, content):
+            hits.update(pattern.findall(content))
+        return hits
     
-    def _check_needs_definition(self, content: str, class_name: str) -> bool:
-        """Check if full class definition is needed"""
-        for pattern in self.definition_patterns:
-            if re.search(rf'\b{class_name}\b', content):
-                matches = pattern.findall(content)
-                if any(class_name == match or class_name in match for match in matches):
-                    return True
-        
-        # Check for method calls on the object (not pointer)
-        # Pattern: objectName.method() where objectName is of type ClassName
-        if re.search(rf'\b\w+\.', content):
-            # This is complex to detect reliably, so be conservative
-            # If we see any dot notation, there might be method calls
-            pass
-        
-        return False
+    @staticmethod
+    def _count_mentions(hits: Counter, class_name: str) -> int:
+        """Count captured names that contain the class name"""
+        return sum(count for name, count in hits.items() if class_name in name)
     
-    def _calculate_confidence(self, content: str, class_name: str) -> float:
+    def _calculate_confidence(self,
+                              content: str,
+                              class_name: str,
+                              pointer_count: int,
+                              definition_count: int) -> float:
         """Calculate confidence that forward declaration will work"""
         confidence = 0.6  # Base confidence
         
         # Higher confidence if we see pointer patterns
-        pointer_count = sum(
-            len([m for m in p.findall(content) if class_name in str(m)])
-            for p in self.pointer_patterns
-        )
         confidence += min(pointer_count * 0.1, 0.3)
         
         # Lower confidence if we see definition patterns
-        definition_count = sum(
-            len([m for m in p.findall(content) if class_name in str(m)])
-            for p in self.definition_patterns
-        )
         confidence -= min(definition_count * 0.15, 0.4)
         
         # Check if class appears in function signatures (good for forward decl)
@@ -164,11 +199,6 @@ class ForwardDeclarationDetector:
     
     def _remove_comments_and_strings(self, content: str) -> str:
         """Remove comments and string literals to avoid false positives"""
-        # Remove // comments
-        content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-        # Remove /* */ comments
-        content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-        # Remove string literals
-        content = re.sub(r'"[^"]*"', '""', content)
-        content = re.sub(r"'[^']*'", "''", content)
-        return content
+        # A space keeps the tokens on either side apart; a constant
+        # replacement avoids a Python callback per match
+        return COMMENT_STRING_PATTERN.sub(' ', content)
@@ -1,9 +1,13 @@
 """
 Dependency Graph - Build and analyze include relationships
 """
+import heapq
+import sys
+from operator import itemgetter
+
 import networkx as nx
 from pathlib import Path
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Dict, Set, TextIO, Tuple, Optional
 from .parser import FileAnalysis, Include
 
 class DependencyGraph:
@@ -26,51 +30,66 @@ class DependencyGraph:
         """
         print(f"Building dependency graph from {len(analyses)} files...")
         
-        # First pass: Add all files as nodes with attributes
+        # Paths repeat across the graph, file_to_includes and header_to_files
+        # (and arrive as separate objects from worker processes), so intern
+        # them: each distinct path is stored once and dict lookups on it
+        # short-circuit on identity
+        intern = sys.intern
+        
+        # First pass: collect all files as nodes with attributes
+        file_nodes = []
         for analysis in analyses:
-            self.graph.add_node(
-                analysis.filepath,
-                lines=analysis.total_lines,
-                code_lines=analysis.code_lines,
-                has_templates=analysis.has_templates,
-                has_macros=analysis.has_macros,
-                namespace_count=analysis.namespace_count,
-                class_count=analysis.class_count,
-                is_external=False,
-                is_header=self._is_header_file(analysis.filepath)
-            )
+            filepath = intern(analysis.filepath)
+            file_nodes.append((filepath, {
+                'lines': analysis.total_lines,
+                'code_lines': analysis.code_lines,
+                'has_templates': analysis.has_templates,
+                'has_macros': analysis.has_macros,
+                'namespace_count': analysis.namespace_count,
+                'class_count': analysis.class_count,
+                'is_external': False,
+                'is_header': self._is_header_file(analysis.filepath),
+            }))
             
-            self.file_to_includes[analysis.filepath] = []
+            self.file_to_includes[filepath] = []
             
             # Build reverse index
             for inc in analysis.includes:
-                header_id = inc.full_path if inc.full_path else inc.header
+                header_id = intern(inc.full_path if inc.full_path else inc.header)
                 if header_id not in self.header_to_files:
                     self.header_to_files[header_id] = set()
-                self.header_to_files[header_id].add(analysis.filepath)
+                self.header_to_files[header_id].add(filepath)
+        
+        self.graph.add_nodes_from(file_nodes)
         
-        # Second pass: Add edges for includes
+        # Second pass: collect edges for includes, plus a node for each
+        # target not already in the graph (external headers; first seen wins)
+        external_nodes: Dict[str, bool] = {}
+        edges = []
         for analysis in analyses:
+            filepath = intern(analysis.filepath)
+            targets = self.file_to_includes[filepath]
             for inc in analysis.includes:
                 # Determine target node ID
                 if inc.full_path and inc.full_path != inc.header:
                     # We resolved the header to an actual file
-                    target = inc.full_path
+                    target = intern(inc.full_path)
                 else:
                     # Use header name (likely external/system)
-                    target = f"<{inc.header}>" if inc.is_system else inc.header
+                    target = intern(f"<{inc.header}>" if inc.is_system else inc.header)
                 
-                # Add target node if not exists (external headers)
-                if target not in self.graph:
-                    self.graph.add_node(
-                        target,
-                        is_external=True,
-                        is_system=inc.is_system
-                    )
+                if target not in external_nodes and target not in self.graph:
+                    external_nodes[target] = inc.is_system
                 
-                # Add edge
-                self.graph.add_edge(analysis.filepath, target)
-                self.file_to_includes[analysis.filepath].append(target)
+                edges.append((filepath, target))
+                targets.append(target)
+        
+        # Add nodes and edges in bulk rather than one call per item
+        self.graph.add_nodes_from(
+            (target, {'is_external': True, 'is_system': is_system})
+            for target, is_system in external_nodes.items()
+        )
+        self.graph.add_edges_from(edges)
         
         print(f"Graph built: {self.graph.number_of_nodes()} nodes, "
               f"{self.graph.number_of_edges()} edges")
@@ -126,20 +145,9 @@ class DependencyGraph:
         if filepath not in self.graph:
             return 0
         
-        descendants = self.get_transitive_dependencies(filepath)
-        if not descendants:
-            return 0
-        
-        max_depth = 0
-        for desc in descendants:
-            try:
-                # Find shortest path length to this descendant
-                path_len = nx.shortest_path_length(self.graph, filepath, desc)
-                max_depth = max(max_depth, path_len)
-            except (nx.NetworkXNoPath, nx.NodeNotFound):
-                continue
-        
-        return max_depth
+        # One BFS yields the shortest path length to every descendant
+        lengths = nx.single_source_shortest_path_length(self.graph, filepath)
+        return max(lengths.values(), default=0)
     
     def get_dependents(self, filepath: str) -> Set[str]:
         """
@@ -159,14 +167,23 @@ class DependencyGraph:
         """
         Find circular dependencies.
         
+        Each strongly connected component with more than one file, or a
+        file that includes itself, is reported once. This is linear in
+        the graph size, unlike enumerating every simple cycle, which can
+        blow up exponentially on tangled include graphs.
+        
         Returns:
-            List of cycles (each cycle is a list of filepaths)
+            List of cycles (each cycle is a sorted list of the filepaths
+            that include each other)
         """
-        try:
-            cycles = list(nx.simple_cycles(self.graph))
-            return cycles
-        except Exception:
-            return []
+        cycles = []
+        for component in nx.strongly_connected_components(self.graph):
+            if len(component) == 1:
+                node = next(iter(component))
+                if not self.graph.has_edge(node, node):
+                    continue
+            cycles.append(sorted(component))
+        return cycles
     
     def get_most_included_headers(self, top_n: int = 10) -> List[Tuple[str, int]]:
         """
@@ -178,21 +195,12 @@ class DependencyGraph:
         Returns:
             List of (header, include_count) tuples
         """
-        include_counts = {}
-        
-        for node in self.graph.nodes():
-            in_degree = self.graph.in_degree(node)
-            if in_degree > 0:
-                include_counts[node] = in_degree
-        
-        # Sort by count
-        sorted_headers = sorted(
-            include_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
+        # nlargest keeps sorted()'s tie order without sorting every node
+        include_counts = (
+            (node, in_degree) for node, in_degree in self.graph.in_degree()
+            if in_degree > 0
         )
-        
-        return sorted_headers[:top_n]
+        return heapq.nlargest(top_n, include_counts, key=itemgetter(1))
     
     def get_heaviest_files(self, top_n: int = 10) -> List[Tuple[str, int]]:
         """
@@ -206,16 +214,15 @@ class DependencyGraph:
         """
         dependency_counts = []
         
-        for node in self.graph.nodes():
-            if self.graph.nodes[node].get('is_external', False):
+        for node, is_external in self.graph.nodes(data='is_external', default=False):
+            if is_external:
                 continue
             
-            dep_count = len(self.get_transitive_dependencies(node))
+            dep_count = len(nx.descendants(self.graph, node))
             if dep_count > 0:
                 dependency_counts.append((node, dep_count))
         
-        dependency_counts.sort(key=lambda x: x[1], reverse=True)
-        return dependency_counts[:top_n]
+        return heapq.nlargest(top_n, dependency_counts, key=itemgetter(1))
     
     def get_node_stats(self) -> Dict:
         """
@@ -227,10 +234,11 @@ class DependencyGraph:
         total_nodes = self.graph.number_of_nodes()
         total_edges = self.graph.number_of_edges()
         
-        internal_nodes = sum(
-            1 for n in self.graph.nodes()
-            if not self.graph.nodes[n].get('is_external', False)
-        )
+        internal = [
+            n for n, is_external in self.graph.nodes(data='is_external', default=False)
+            if not is_external
+        ]
+        internal_nodes = len(internal)
         external_nodes = total_nodes - internal_nodes
         
         cycles = self.find_cycles()
@@ -247,8 +255,7 @@ class DependencyGraph:
             'avg_degree': avg_degree,
             'cycles': len(cycles),
             'max_depth': max(
-                (self.get_dependency_depth(n) for n in self.graph.nodes()
-                 if not self.graph.nodes[n].get('is_external', False)),
+                (self.get_dependency_depth(n) for n in internal),
                 default=0
             )
         }
@@ -261,6 +268,21 @@ class DependencyGraph:
             output_path: Path to save DOT file
             max_nodes: Maximum nodes to include (for large graphs)
         """
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            self.export_dot_stream(f, max_nodes)
+        print(f"DOT file saved to {output_path}")
+    
+    def export_dot_stream(self, fp: TextIO, max_nodes: int = 100) -> None:
+        """
+        Write graph in DOT format to an open text file.
+        
+        Each node and edge is written as it is visited, so the document is
+        never held in memory as a whole.
+        
+        Args:
+            fp: Writable text file
+            max_nodes: Maximum nodes to include (for large graphs)
+        """
         # For large graphs, only show internal nodes
         if self.graph.number_of_nodes() > max_nodes:
             subgraph = self.graph.subgraph([
@@ -270,13 +292,17 @@ class DependencyGraph:
         else:
             subgraph = self.graph
         
-        # Write DOT file
-        try:
-            from networkx.drawing.nx_pydot import write_dot
-            write_dot(subgraph, str(output_path))
-            print(f"DOT file saved to {output_path}")
-        except ImportError:
-            print("Warning: pydot not installed, skipping DOT export")
+        write = fp.write
+        write("strict digraph {\n")
+        for node, attrs in subgraph.nodes(data=True):
+            if attrs:
+                attr_list = ", ".join(f"{key}={_dot_id(value)}" for key, value in attrs.items())
+                write(f"{_dot_id(node)} [{attr_list}];\n")
+            else:
+                write(f"{_dot_id(node)};\n")
+        for source, target in subgraph.edges():
+            write(f"{_dot_id(source)} -> {_dot_id(target)};\n")
+        write("}\n")
     
     def export_graphml(self, output_path: Path) -> None:
         """
@@ -287,3 +313,10 @@ class DependencyGraph:
         """
         nx.write_graphml(self.graph, str(output_path))
         print(f"GraphML file saved to {output_path}")
+
+
+def _dot_id(value) -> str:
+    """Quote a node name or attribute value as a DOT ID"""
+    # Only \" is an escape in a quoted DOT string; backslashes in
+    # Windows paths are kept as-is
+    return '"' + str(value).replace('"', '\\"') + '"'
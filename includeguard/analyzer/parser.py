@@ -1,12 +1,33 @@
 """
 Include Parser - Fast regex-based C++ include extraction
 """
+import hashlib
+import json
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Dict, Set, Optional
+from typing import Callable, Iterator, List, Dict, Set, Optional, Tuple, Union
 from dataclasses import dataclass, field
 
-@dataclass
+# Projects with fewer files than this are parsed in-process: starting
+# worker processes would cost more than the parsing itself
+PARALLEL_PARSE_THRESHOLD = 64
+
+# Bump when the on-disk parse cache format or the parse results change
+PARSE_CACHE_VERSION = 1
+
+# FileAnalysis fields stored per cache entry, besides the includes
+_CACHED_METRICS = ('total_lines', 'code_lines', 'comment_lines', 'blank_lines',
+                   'has_templates', 'has_macros', 'namespace_count', 'class_count')
+
+# Slotted dataclasses drop the per-instance __dict__; large projects hold
+# hundreds of thousands of Include objects. slots= needs Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class Include:
     """Represents a single #include directive"""
     header: str
@@ -18,7 +39,7 @@ class Include:
         bracket = ('<', '>') if self.is_system else ('"', '"')
         return f"Include({bracket[0]}{self.header}{bracket[1]} at line {self.line_number})"
 
-@dataclass
+@dataclass(**_SLOTS)
 class FileAnalysis:
     """Analysis results for a single source file"""
     filepath: str
@@ -41,30 +62,53 @@ class IncludeParser:
     Doesn't require compilation or libclang.
     """
     
-    # Regex patterns
+    # Regex patterns. Directives are matched within one line ([ \t], not \s):
+    # a \s* anchored at every line start rescans runs of blank lines, which
+    # is quadratic, and lets a match begin on an earlier blank line
     INCLUDE_PATTERN = re.compile(
-        r'^\s*#\s*include\s*([<"])([^>"]+)([>"])',
+        r'^[ \t]*#[ \t]*include[ \t]*([<"])([^>"\n]+)([>"])',
         re.MULTILINE
     )
     
-    SINGLE_COMMENT = re.compile(r'//.*?$', re.MULTILINE)
-    MULTI_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+    # Line and block comments in one pass, whichever starts first
+    COMMENT_PATTERN = re.compile(r'//[^\n]*|/\*.*?\*/', re.DOTALL)
     TEMPLATE_PATTERN = re.compile(r'\btemplate\s*<')
-    MACRO_PATTERN = re.compile(r'^\s*#\s*define\s+', re.MULTILINE)
-    NAMESPACE_PATTERN = re.compile(r'\bnamespace\s+\w+')
-    CLASS_PATTERN = re.compile(r'\b(class|struct)\s+\w+')
+    MACRO_PATTERN = re.compile(r'^[ \t]*#[ \t]*define\s+', re.MULTILINE)
+    # Namespaces (group 1 set) and classes/structs, counted in one scan
+    DECLARATION_PATTERN = re.compile(r'\b(?:(namespace)|class|struct)\s+\w+')
     
-    def __init__(self, project_root: Path, include_paths: List[Path] = None):
+    def __init__(self, project_root: Path, include_paths: List[Path] = None,
+                 cache_file: Optional[Union[str, Path]] = None):
         """
         Initialize parser.
         
         Args:
             project_root: Root directory of the project
             include_paths: Additional include search paths
+            cache_file: Optional JSON file persisting parse results across runs
         """
         self.project_root = Path(project_root).resolve()
         self.include_paths = [Path(p).resolve() for p in (include_paths or [])]
         self.include_paths.insert(0, self.project_root)  # Search project root first
+        # (header, including directory) -> resolved path; many files share
+        # headers, so each lookup costs its exists() calls only once
+        self._resolve_cache: Dict[Tuple[str, Path], str] = {}
+        # On-disk parse results keyed by SHA-256 of the file contents. Only
+        # what the contents determine is stored; includes are re-resolved on
+        # load, since headers may have been added or moved since
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._persisted: Dict[str, Dict] = self._load_parse_cache()
+        # Entries hit or added in this run; only these are saved back
+        self._persisted_used: Dict[str, Dict] = {}
+        self._persisted_dirty = False
+    
+    def __getstate__(self):
+        # Parse workers never touch the on-disk cache; don't copy it to them
+        state = self.__dict__.copy()
+        state['cache_file'] = None
+        state['_persisted'] = {}
+        state['_persisted_used'] = {}
+        return state
         
     def parse_file(self, filepath: Path) -> Optional[FileAnalysis]:
         """
@@ -85,7 +129,10 @@ class IncludeParser:
         
         analysis = FileAnalysis(filepath=str(filepath))
         
-        # Parse includes
+        # Parse includes, tracking line numbers with a running newline count
+        # instead of recounting the whole prefix for every include
+        line_num = 1
+        cursor = 0
         for match in self.INCLUDE_PATTERN.finditer(content):
             open_bracket = match.group(1)
             header = match.group(2)
@@ -96,7 +143,8 @@ class IncludeParser:
                (open_bracket == '"' and close_bracket != '"'):
                 continue
             
-            line_num = content[:match.start()].count('\n') + 1
+            line_num += content.count('\n', cursor, match.start())
+            cursor = match.start()
             is_system = (open_bracket == '<')
             
             full_path = self._resolve_include(header, filepath, is_system)
@@ -123,8 +171,11 @@ class IncludeParser:
         # Detect features
         analysis.has_templates = bool(self.TEMPLATE_PATTERN.search(content))
         analysis.has_macros = bool(self.MACRO_PATTERN.search(content))
-        analysis.namespace_count = len(self.NAMESPACE_PATTERN.findall(content))
-        analysis.class_count = len(self.CLASS_PATTERN.findall(content))
+        for match in self.DECLARATION_PATTERN.finditer(content):
+            if match.group(1):
+                analysis.namespace_count += 1
+            else:
+                analysis.class_count += 1
         
         return analysis
     
@@ -144,9 +195,16 @@ class IncludeParser:
             # System headers - return with brackets for identification
             return f"<{header}>"
         
-        # User headers - try to find actual file
-        # First, try relative to source file
         source_dir = source_file.parent
+        key = (header, source_dir)
+        resolved = self._resolve_cache.get(key)
+        if resolved is None:
+            resolved = self._resolve_cache[key] = self._find_header(header, source_dir)
+        return resolved
+    
+    def _find_header(self, header: str, source_dir: Path) -> str:
+        """Search the source directory, then the include paths, for a user header"""
+        # First, try relative to source file
         candidate = source_dir / header
         if candidate.exists():
             return str(candidate.resolve())
@@ -170,21 +228,25 @@ class IncludeParser:
         Returns:
             Content with comments removed
         """
-        # Remove multi-line comments first
-        content = self.MULTI_COMMENT.sub('', content)
-        # Remove single-line comments
-        content = self.SINGLE_COMMENT.sub('', content)
-        return content
+        return self.COMMENT_PATTERN.sub('', content)
     
     def parse_project(self, 
                      extensions: List[str] = None,
-                     exclude_dirs: List[str] = None) -> List[FileAnalysis]:
+                     exclude_dirs: List[str] = None,
+                     max_workers: Optional[int] = None,
+                     progress: Optional[Callable[[int, int], None]] = None) -> List[FileAnalysis]:
         """
         Parse all C++ files in project.
         
+        Large projects are parsed in a process pool, since parsing is
+        CPU-bound regex work that threads cannot spread across cores.
+        
         Args:
             extensions: File extensions to parse (default: common C++ extensions)
             exclude_dirs: Directory names to exclude (default: build dirs)
+            max_workers: Parser processes to use (default: CPU count)
+            progress: Optional callback, called with (files done, total files)
+                as results come in
             
         Returns:
             List of FileAnalysis objects
@@ -197,23 +259,193 @@ class IncludeParser:
                           'cmake-build-release', '.git', '.svn', 'node_modules',
                           'venv', 'env', '__pycache__']
         
-        results = []
-        exclude_set = set(exclude_dirs)
-        
         print(f"Scanning {self.project_root} for C++ files...")
         
-        for ext in extensions:
-            for filepath in self.project_root.rglob(f'*{ext}'):
-                # Check if file is in excluded directory
-                if any(excluded in filepath.parts for excluded in exclude_set):
-                    continue
-                
-                analysis = self.parse_file(filepath)
-                if analysis:
-                    results.append(analysis)
+        files = list(self.iter_source_files(extensions, exclude_dirs))
+        results = [a for a in self.parse_files(files, max_workers, progress) if a]
         
         print(f"Found {len(results)} C++ files")
         return results
+    
+    def iter_source_files(self,
+                          extensions: List[str],
+                          exclude_dirs: List[str]) -> Iterator[str]:
+        """
+        Walk the project once, yielding paths of files with a C++ extension.
+        
+        Excluded directories are pruned rather than walked and filtered.
+        Like Path.rglob, symlinked directories are not followed and suffix
+        matching is case-sensitive except on case-insensitive platforms.
+        
+        Args:
+            extensions: File extensions to include
+            exclude_dirs: Directory names to skip
+            
+        Yields:
+            File paths, directory by directory in sorted order
+        """
+        ext_set = frozenset(os.path.normcase(ext) for ext in extensions)
+        exclude_set = frozenset(exclude_dirs)
+        
+        for root, dirs, filenames in os.walk(self.project_root):
+            dirs[:] = sorted(d for d in dirs if d not in exclude_set)
+            for name in sorted(filenames):
+                if os.path.normcase(os.path.splitext(name)[1]) in ext_set:
+                    yield os.path.join(root, name)
+    
+    def parse_files(self,
+                    files: List[Union[str, Path]],
+                    max_workers: Optional[int] = None,
+                    progress: Optional[Callable[[int, int], None]] = None) -> List[Optional[FileAnalysis]]:
+        """
+        Parse several files, in parallel processes when there are many.
+        
+        With a cache_file, files whose contents match a cached entry are not
+        parsed again; call save_parse_cache() to persist new results.
+        
+        Args:
+            files: Paths to C++ files
+            max_workers: Parser processes to use (default: CPU count)
+            progress: Optional callback, called with (files done, total files)
+                as results come in
+            
+        Returns:
+            FileAnalysis (or None) for each file, in the same order as ``files``
+        """
+        if self.cache_file is not None:
+            return self._parse_files_cached(files, max_workers, progress)
+        return self._parse_files(files, max_workers, progress)
+    
+    def _parse_files_cached(self,
+                            files: List[Union[str, Path]],
+                            max_workers: Optional[int],
+                            progress: Optional[Callable[[int, int], None]]) -> List[Optional[FileAnalysis]]:
+        """Parse files, taking unchanged ones from the on-disk cache"""
+        results: List[Optional[FileAnalysis]] = [None] * len(files)
+        misses = []  # (index, content digest or None if unreadable)
+        
+        for i, f in enumerate(files):
+            path = Path(f).resolve()
+            try:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                misses.append((i, None))  # parse_file reports the error
+                continue
+            
+            entry = self._persisted.get(digest)
+            analysis = self._analysis_from_entry(path, entry) if entry else None
+            if analysis is None:
+                misses.append((i, digest))
+            else:
+                self._persisted_used[digest] = entry
+                results[i] = analysis
+        
+        total = len(files)
+        hits = total - len(misses)
+        if progress is not None:
+            progress(hits, total)
+        miss_progress = ((lambda done, _: progress(hits + done, total))
+                         if progress is not None else None)
+        
+        parsed = self._parse_files([files[i] for i, _ in misses], max_workers, miss_progress)
+        for (i, digest), analysis in zip(misses, parsed):
+            results[i] = analysis
+            if analysis is not None and digest is not None:
+                entry = self._entry_from_analysis(analysis)
+                self._persisted[digest] = self._persisted_used[digest] = entry
+                self._persisted_dirty = True
+        
+        return results
+    
+    def _analysis_from_entry(self, path: Path, entry: Dict) -> Optional[FileAnalysis]:
+        """Rebuild a FileAnalysis from a cache entry (None if malformed)"""
+        try:
+            includes = [
+                Include(header=header,
+                        line_number=line_number,
+                        is_system=is_system,
+                        full_path=self._resolve_include(header, path, is_system))
+                for header, line_number, is_system in entry['includes']
+            ]
+            return FileAnalysis(filepath=str(path), includes=includes,
+                                **{name: entry[name] for name in _CACHED_METRICS})
+        except (KeyError, TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _entry_from_analysis(analysis: FileAnalysis) -> Dict:
+        """Cache entry holding what a file's contents determine"""
+        entry = {name: getattr(analysis, name) for name in _CACHED_METRICS}
+        entry['includes'] = [
+            [inc.header, inc.line_number, inc.is_system] for inc in analysis.includes
+        ]
+        return entry
+    
+    def _load_parse_cache(self) -> Dict[str, Dict]:
+        """Read the on-disk parse cache, ignoring missing or outdated files"""
+        if self.cache_file is None:
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != PARSE_CACHE_VERSION:
+            return {}
+        entries = data.get('entries')
+        return entries if isinstance(entries, dict) else {}
+    
+    def save_parse_cache(self):
+        """
+        Write this run's parse results to the on-disk cache.
+        
+        Only entries for files parsed in this run are kept, so results for
+        deleted or edited files do not accumulate. Does nothing if caching
+        is disabled or nothing changed. The file is replaced atomically so
+        a concurrent run never reads a partial cache.
+        """
+        if self.cache_file is None:
+            return
+        if not self._persisted_dirty and self._persisted_used.keys() == self._persisted.keys():
+            return
+        data = {'version': PARSE_CACHE_VERSION, 'entries': self._persisted_used}
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_name(
+            f"{self.cache_file.name}.{os.getpid()}.tmp"
+        )
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_file, self.cache_file)
+        self._persisted = dict(self._persisted_used)
+        self._persisted_dirty = False
+    
+    def _parse_files(self,
+                     files: List[Union[str, Path]],
+                     max_workers: Optional[int],
+                     progress: Optional[Callable[[int, int], None]] = None) -> List[Optional[FileAnalysis]]:
+        """Parse files without the cache, in a process pool when there are many"""
+        results: List[Optional[FileAnalysis]] = []
+        total = len(files)
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and total >= PARALLEL_PARSE_THRESHOLD:
+            chunksize = max(1, total // (workers * 4))
+            try:
+                with ProcessPoolExecutor(max_workers=workers,
+                                         initializer=_init_parse_worker,
+                                         initargs=(self,)) as executor:
+                    for analysis in executor.map(_parse_file_worker, files,
+                                                 chunksize=chunksize):
+                        results.append(analysis)
+                        if progress is not None:
+                            progress(len(results), total)
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                pass  # No usable process pool here; finish in-process instead
+        
+        for f in files[len(results):]:
+            results.append(self.parse_file(f))
+            if progress is not None:
+                progress(len(results), total)
+        return results
 
     def get_statistics(self, analyses: List[FileAnalysis]) -> Dict:
         """
@@ -229,20 +461,28 @@ class IncludeParser:
             return {}
         
         total_files = len(analyses)
-        total_includes = sum(len(a.includes) for a in analyses)
-        total_lines = sum(a.total_lines for a in analyses)
-        total_code = sum(a.code_lines for a in analyses)
+        total_includes = 0
+        system_includes = 0
+        total_lines = 0
+        total_code = 0
+        files_with_templates = 0
+        files_with_macros = 0
         
-        system_includes = sum(
-            sum(1 for inc in a.includes if inc.is_system)
-            for a in analyses
-        )
+        # One pass over the analyses instead of one generator per statistic
+        for a in analyses:
+            total_lines += a.total_lines
+            total_code += a.code_lines
+            if a.has_templates:
+                files_with_templates += 1
+            if a.has_macros:
+                files_with_macros += 1
+            total_includes += len(a.includes)
+            for inc in a.includes:
+                if inc.is_system:
+                    system_includes += 1
         
         user_includes = total_includes - system_includes
         
-        files_with_templates = sum(1 for a in analyses if a.has_templates)
-        files_with_macros = sum(1 for a in analyses if a.has_macros)
-        
         return {
             'total_files': total_files,
             'total_includes': total_includes,
@@ -255,3 +495,18 @@ class IncludeParser:
             'files_with_templates': files_with_templates,
             'files_with_macros': files_with_macros,
         }
+
+
+# Parser owned by each parse_files worker process
+_worker_parser: Optional[IncludeParser] = None
+
+
+def _init_parse_worker(parser: IncludeParser):
+    """Install the parser a worker process uses for every file"""
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _parse_file_worker(filepath: Path) -> Optional[FileAnalysis]:
+    """Parse one file in a worker process"""
+    return _worker_parser.parse_file(filepath)
@@ -1,11 +1,36 @@
 """
 PCH Recommender - Suggest optimal precompiled header configuration
 """
-from typing import List, Dict, Set
-from collections import Counter
+import heapq
+import os
+import sys
+from typing import List, Dict, Optional, Set
+from collections import Counter, defaultdict
+from operator import itemgetter
 from .parser import FileAnalysis
 
 
+# Fixed lines around the #include list of a generated PCH file
+PCH_FILE_PROLOGUE = (
+    "// Precompiled Header File",
+    "// Generated by IncludeGuard",
+    "//",
+    "// This file should be included first in all translation units.",
+    "// Compile with: g++ -x c++-header pch.h -o pch.h.gch",
+    "//",
+    "",
+    "#ifndef PCH_H",
+    "#define PCH_H",
+    "",
+    "// Most frequently used and expensive headers",
+    "",
+)
+PCH_FILE_EPILOGUE = (
+    "",
+    "#endif // PCH_H",
+)
+
+
 class PCHRecommender:
     """
     Recommends headers for precompiled header (PCH) files.
@@ -33,6 +58,11 @@ class PCHRecommender:
             '<fstream>', '<sstream>', '<iomanip>', '<stdexcept>',
             '<type_traits>', '<chrono>', '<thread>', '<mutex>',
         }
+        # Score multiplier for stable system headers; other system headers
+        # get 1.2 and project headers 1.0
+        self._stable_bonus = {h: 1.5 for h in self.stable_system_headers}
+        # Files using each header, from the last recommend_pch_headers call
+        self.header_files: Dict[str, Set[str]] = {}
     
     def recommend_pch_headers(self,
                              all_analyses: List[FileAnalysis],
@@ -55,26 +85,33 @@ class PCHRecommender:
         """
         # Count header usage across all files
         header_usage = Counter()
-        header_costs = {}
-        header_files = {}  # Track which files use each header
+        header_files = defaultdict(set)  # Track which files use each header
+        
+        # The same header names recur in every file, each parsed into its
+        # own string; interning them makes repeated dict and set lookups
+        # short-circuit on identity
+        intern = sys.intern
         
         for analysis in all_analyses:
-            for inc in analysis.includes:
-                header_key = inc.header
-                header_usage[header_key] += 1
-                
-                # Track files using this header
-                if header_key not in header_files:
-                    header_files[header_key] = set()
-                header_files[header_key].add(Path(analysis.filepath).name)
-                
-                # Get cost estimate
-                if header_key not in header_costs:
-                    cost = estimator.estimate_header_cost(inc.header)
-                    header_costs[header_key] = cost
-        
-        # Calculate PCH scores
-        recommendations = []
+            filename = intern(os.path.basename(analysis.filepath))
+            headers = [intern(inc.header) for inc in analysis.includes]
+            # Counter.update on a list counts in C
+            header_usage.update(headers)
+            for header_key in headers:
+                header_files[header_key].add(filename)
+        
+        # Get cost estimates, once per distinct header
+        header_costs = {
+            header: estimator.estimate_header_cost(header)
+            for header in header_usage
+        }
+        
+        self.header_files = header_files
+        
+        # Calculate PCH scores. Candidates are kept as plain tuples; output
+        # records are only built for the ones that make the cut
+        candidates = []
+        stable_bonus = self._stable_bonus
         
         for header, usage_count in header_usage.items():
             if usage_count < min_usage_count:
@@ -96,13 +133,27 @@ class PCHRecommender:
             estimated_savings = (cost * usage_count) - pch_creation_cost
             
             # Bonus for stable system headers
-            is_system = header.startswith('<')
-            is_stable = header in self.stable_system_headers
-            stability_bonus = 1.5 if is_stable else (1.2 if is_system else 1.0)
+            is_system = header[:1] == '<'
+            stability_bonus = stable_bonus.get(header)
+            is_stable = stability_bonus is not None
+            if not is_stable:
+                stability_bonus = 1.2 if is_system else 1.0
             
             # Adjusted score with stability
             adjusted_score = pch_score * stability_bonus
             
+            candidates.append((adjusted_score, header, usage_count, cost,
+                               estimated_savings, is_system, is_stable))
+        
+        # Highest PCH scores first; only the top entries are returned, so
+        # select them rather than sorting everything (same order as
+        # sorted(..., reverse=True)[:n])
+        top_candidates = heapq.nlargest(max_recommendations, candidates, key=itemgetter(0))
+        
+        recommendations = []
+        for (adjusted_score, header, usage_count, cost,
+             estimated_savings, is_system, is_stable) in top_candidates:
+            files = header_files[header]
             recommendations.append({
                 'header': header,
                 'usage_count': usage_count,
@@ -111,14 +162,11 @@ class PCHRecommender:
                 'estimated_savings': max(0, estimated_savings),
                 'is_system': is_system,
                 'is_stable': is_stable,
-                'used_by_files': sorted(list(header_files[header]))[:5],  # Top 5 files
-                'total_files_using': len(header_files[header])
+                'used_by_files': heapq.nsmallest(5, files),  # Top 5 files
+                'total_files_using': len(files)
             })
         
-        # Sort by PCH score (highest first)
-        recommendations.sort(key=lambda x: x['pch_score'], reverse=True)
-        
-        return recommendations[:max_recommendations]
+        return recommendations
     
     def generate_pch_file_content(self, recommendations: List[Dict], max_headers: int = 15) -> str:
         """
@@ -131,41 +179,23 @@ class PCHRecommender:
         Returns:
             String content for the PCH file
         """
-        lines = [
-            "// Precompiled Header File",
-            "// Generated by IncludeGuard",
-            "//",
-            "// This file should be included first in all translation units.",
-            "// Compile with: g++ -x c++-header pch.h -o pch.h.gch",
-            "//",
-            "",
-            "#ifndef PCH_H",
-            "#define PCH_H",
-            "",
-            "// Most frequently used and expensive headers",
-            ""
-        ]
-        
-        # Add headers
-        for rec in recommendations[:max_headers]:
-            header = rec['header']
-            usage = rec['usage_count']
-            cost = rec['cost']
-            lines.append(f"#include {header}  // Used by {usage} files, cost: {cost:.0f}")
-        
-        lines.extend([
-            "",
-            "#endif // PCH_H"
-        ])
-        
-        return '\n'.join(lines)
+        rows = (
+            f"#include {rec['header']}  // Used by {rec['usage_count']} files, cost: {rec['cost']:.0f}"
+            for rec in recommendations[:max_headers]
+        )
+        return '\n'.join((*PCH_FILE_PROLOGUE, *rows, *PCH_FILE_EPILOGUE))
     
-    def estimate_pch_benefit(self, recommendations: List[Dict]) -> Dict:
+    def estimate_pch_benefit(self,
+                             recommendations: List[Dict],
+                             header_files: Optional[Dict[str, Set[str]]] = None) -> Dict:
         """
         Estimate the overall benefit of using PCH.
         
         Args:
             recommendations: List of PCH recommendations
+            header_files: Optional full header -> files mapping (such as
+                self.header_files); without it only each recommendation's
+                used_by_files sample is counted
             
         Returns:
             Dict with benefit metrics
@@ -179,12 +209,12 @@ class PCHRecommender:
         
         total_savings = sum(r['estimated_savings'] for r in recommendations)
         
-        # Count unique files that would benefit
-        all_files = set()
-        for rec in recommendations:
-            all_files.update(rec.get('used_by_files', []))
-        
-        files_benefiting = len(all_files)
+        # Count unique files that would benefit, in one union
+        if header_files is not None:
+            file_sets = (header_files.get(r['header'], ()) for r in recommendations)
+        else:
+            file_sets = (r.get('used_by_files', []) for r in recommendations)
+        files_benefiting = len(set().union(*file_sets))
         
         # Estimate speedup percentage
         # PCH typically provides 40-60% speedup for clean builds
@@ -197,7 +227,3 @@ class PCHRecommender:
             'estimated_speedup': estimated_speedup,
             'headers_in_pch': len(recommendations)
         }
-
-
-# Import Path for file tracking
-from pathlib import Path
@@ -4,10 +4,23 @@ GitHub Actions integration for IncludeGuard
 Generates PR comments and checks quality thresholds for CI/CD pipelines.
 """
 import json
+import mmap
+import os
 import sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+try:
+    import orjson  # Optional: parses large analysis files several times faster
+except ImportError:
+    orjson = None
+
+# Row templates for the PR comment's issue lists
+_HIGH_ROW = "- `{file}` line {line}: `{header}` (cost: {cost:.0f}) - unused\n"
+_MEDIUM_ROW = "- `{file}` line {line}: `{header}` (cost: {cost:.0f})\n"
+_FWD_ROW = "- `{file}`: Replace `#include \"{header}\"` with `{suggestion}` (confidence: {confidence:.0%})\n"
+_PCH_ROW = "- `{header}`: Used in {usage_count} files (total cost: {total_cost:.0f})\n"
+
 
 def generate_pr_comment(analysis_data: Dict) -> str:
     """
@@ -28,113 +41,175 @@ def generate_pr_comment(analysis_data: Dict) -> str:
     waste_pct = summary.get('waste_percentage', 0)
     total_files = summary.get('total_files', 0)
     
-    comment = f"""## 📊 IncludeGuard Analysis
+    parts = [f"""## 📊 IncludeGuard Analysis
 
 **Build Impact**: {total_cost:,.0f} cost units  
 **Potential Waste**: {total_waste:,.0f} units ({waste_pct:.1f}%)  
 **Files Analyzed**: {total_files}
 
-"""
+"""]
     
     # Get top opportunities
     opportunities = summary.get('top_opportunities', [])[:15]
     
     if not opportunities:
-        comment += "### ✅ No issues found!\n\n"
-        comment += "All includes appear necessary and optimized.\n"
-        comment += "\n---\n"
-        comment += "*🛡️ Analyzed by [IncludeGuard](https://github.com/HarshithaJ28/IncludeGuard)*\n"
-        return comment
+        parts.append("### ✅ No issues found!\n\n")
+        parts.append("All includes appear necessary and optimized.\n")
+        parts.append("\n---\n")
+        parts.append("*🛡️ Analyzed by [IncludeGuard](https://github.com/HarshithaJ28/IncludeGuard)*\n")
+        return ''.join(parts)
+    
+    # Issues section - group by severity: high priority (cost > 1500) and
+    # medium priority (cost 500-1500), split in one pass with each cost
+    # kept alongside its opportunity
+    parts.append("### ⚠️ Issues Found\n\n")
+    
+    high_cost = []
+    medium_cost = []
+    total_savings = 0
+    for opp in opportunities:
+        cost = opp.get('cost', 0)
+        total_savings += cost
+        if cost > 1500:
+            high_cost.append((opp, cost))
+        elif cost > 500:
+            medium_cost.append((opp, cost))
     
-    # Issues section - group by severity
-    comment += "### ⚠️ Issues Found\n\n"
-    
-    # High priority (cost > 1500)
-    high_cost = [o for o in opportunities if o.get('cost', 0) > 1500]
     if high_cost:
-        comment += f"**🔴 High Priority ({len(high_cost)} unused includes)**\n"
-        for opp in high_cost[:5]:
-            file = opp.get('file', 'unknown')
-            line = opp.get('line', 0)
-            header = opp.get('header', 'unknown')
-            cost = opp.get('cost', 0)
-            comment += f"- `{file}` line {line}: `{header}` (cost: {cost:.0f}) - unused\n"
+        parts.append(f"**🔴 High Priority ({len(high_cost)} unused includes)**\n")
+        for opp, cost in high_cost[:5]:
+            parts.append(_HIGH_ROW.format(
+                file=opp.get('file', 'unknown'),
+                line=opp.get('line', 0),
+                header=opp.get('header', 'unknown'),
+                cost=cost
+            ))
         if len(high_cost) > 5:
-            comment += f"- ... and {len(high_cost) - 5} more high-priority issues\n"
-        comment += "\n"
+            parts.append(f"- ... and {len(high_cost) - 5} more high-priority issues\n")
+        parts.append("\n")
     
-    # Medium priority (cost 500-1500)
-    medium_cost = [o for o in opportunities if 500 < o.get('cost', 0) <= 1500]
     if medium_cost:
-        comment += f"**🟡 Medium Priority ({len(medium_cost)} unused includes)**\n"
-        for opp in medium_cost[:3]:
-            file = opp.get('file', 'unknown')
-            line = opp.get('line', 0)
-            header = opp.get('header', 'unknown')
-            cost = opp.get('cost', 0)
-            comment += f"- `{file}` line {line}: `{header}` (cost: {cost:.0f})\n"
+        parts.append(f"**🟡 Medium Priority ({len(medium_cost)} unused includes)**\n")
+        for opp, cost in medium_cost[:3]:
+            parts.append(_MEDIUM_ROW.format(
+                file=opp.get('file', 'unknown'),
+                line=opp.get('line', 0),
+                header=opp.get('header', 'unknown'),
+                cost=cost
+            ))
         if len(medium_cost) > 3:
-            comment += f"- ... and {len(medium_cost) - 3} more medium-priority issues\n"
-        comment += "\n"
+            parts.append(f"- ... and {len(medium_cost) - 3} more medium-priority issues\n")
+        parts.append("\n")
     
     # Forward declaration opportunities
     fwd_decls = analysis_data.get('forward_declarations', [])[:5]
     if fwd_decls:
-        comment += f"**💡 Forward Declaration Opportunities ({len(fwd_decls)})**\n"
+        parts.append(f"**💡 Forward Declaration Opportunities ({len(fwd_decls)})**\n")
         for fwd in fwd_decls:
-            file = fwd.get('file', 'unknown')
-            header = fwd.get('header', 'unknown')
-            suggestion = fwd.get('suggestion', '')
-            confidence = fwd.get('confidence', 0)
-            comment += f"- `{file}`: Replace `#include \"{header}\"` "
-            comment += f"with `{suggestion}` (confidence: {confidence:.0%})\n"
-        comment += "\n"
+            parts.append(_FWD_ROW.format(
+                file=fwd.get('file', 'unknown'),
+                header=fwd.get('header', 'unknown'),
+                suggestion=fwd.get('suggestion', ''),
+                confidence=fwd.get('confidence', 0)
+            ))
+        parts.append("\n")
     
     # PCH recommendations
     pch_recommendations = analysis_data.get('pch_recommendations', [])
     if pch_recommendations and len(pch_recommendations) > 0:
-        comment += f"**⚡ Precompiled Header Candidates ({len(pch_recommendations)})**\n"
+        parts.append(f"**⚡ Precompiled Header Candidates ({len(pch_recommendations)})**\n")
         for pch in pch_recommendations[:3]:
-            header = pch.get('header', 'unknown')
-            usage_count = pch.get('usage_count', 0)
-            total_cost = pch.get('total_cost', 0)
-            comment += f"- `{header}`: Used in {usage_count} files (total cost: {total_cost:.0f})\n"
-        comment += "\n"
+            parts.append(_PCH_ROW.format(
+                header=pch.get('header', 'unknown'),
+                usage_count=pch.get('usage_count', 0),
+                total_cost=pch.get('total_cost', 0)
+            ))
+        parts.append("\n")
     
     # Action items / recommendations
-    comment += "### ✅ Action Items\n\n"
-    
-    total_savings = sum(o.get('cost', 0) for o in opportunities)
+    parts.append("### ✅ Action Items\n\n")
     
     if high_cost or medium_cost:
         total_removable = len(high_cost) + len(medium_cost)
-        comment += f"1. **Remove {total_removable} unnecessary includes**\n"
-        comment += f"   - Estimated savings: {total_savings:,.0f} cost units\n"
+        parts.append(f"1. **Remove {total_removable} unnecessary includes**\n")
+        parts.append(f"   - Estimated savings: {total_savings:,.0f} cost units\n")
     
     if fwd_decls:
-        comment += f"2. **Apply {len(fwd_decls)} forward declarations**\n"
-        comment += f"   - Further reduce compile dependencies\n"
+        parts.append(f"2. **Apply {len(fwd_decls)} forward declarations**\n")
+        parts.append(f"   - Further reduce compile dependencies\n")
     
     if pch_recommendations:
-        comment += f"3. **Consider precompiled headers**\n"
-        comment += f"   - {len(pch_recommendations)} frequently-used headers identified\n"
+        parts.append(f"3. **Consider precompiled headers**\n")
+        parts.append(f"   - {len(pch_recommendations)} frequently-used headers identified\n")
     
-    comment += f"\n**Overall potential improvement: -{waste_pct:.1f}% build time**\n\n"
+    parts.append(f"\n**Overall potential improvement: -{waste_pct:.1f}% build time**\n\n")
     
     # Auto-fix suggestion
-    comment += "### 🔧 Automated Fixes Available\n\n"
-    comment += "Generate an auto-fix patch:\n"
-    comment += "```bash\n"
-    comment += "includeguard fix-generate . --output fixes.patch\n"
-    comment += "git apply fixes.patch\n"
-    comment += "```\n\n"
+    parts.append("### 🔧 Automated Fixes Available\n\n")
+    parts.append("Generate an auto-fix patch:\n")
+    parts.append("```bash\n")
+    parts.append("includeguard fix-generate . --output fixes.patch\n")
+    parts.append("git apply fixes.patch\n")
+    parts.append("```\n\n")
     
     # Footer
-    comment += "---\n"
-    comment += "*🛡️ Analyzed by [IncludeGuard](https://github.com/HarshithaJ28/IncludeGuard) "
-    comment += "| [View detailed report](../../../actions)*\n"
+    parts.append("---\n")
+    parts.append("*🛡️ Analyzed by [IncludeGuard](https://github.com/HarshithaJ28/IncludeGuard) ")
+    parts.append("| [View detailed report](../../../actions)*\n")
     
-    return comment
+    return ''.join(parts)
+
+
+def load_analysis(analysis_file: Path) -> Dict:
+    """
+    Load IncludeGuard JSON analysis results.
+    
+    Uses orjson when it is installed, parsing straight from a memory map
+    so the file is never copied into a bytes object. Falls back to the
+    standard json module (also for documents orjson rejects, such as NaN
+    values). Every report is read, since the PR comment scans all of them.
+    
+    Args:
+        analysis_file: Path to the analysis JSON file
+        
+    Returns:
+        Parsed analysis results
+    """
+    with open(analysis_file, 'rb') as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                try:
+                    with memoryview(mm) as view:
+                        return orjson.loads(view)
+                except ValueError:
+                    pass
+        f.seek(0)
+        return json.load(f)
+
+
+def save_analysis(analysis_data: Dict, analysis_file: Path, indent: bool = True):
+    """
+    Write IncludeGuard JSON analysis results.
+    
+    Uses orjson when it is installed; otherwise the standard json module
+    streams the document to the file instead of building it in memory.
+    
+    Args:
+        analysis_data: Analysis results to write
+        analysis_file: Destination path
+        indent: Pretty-print with two-space indentation
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            Path(analysis_file).write_bytes(orjson.dumps(analysis_data, option=option))
+            return
+        except TypeError:
+            pass
+    with open(analysis_file, 'w', encoding='utf-8') as f:
+        json.dump(analysis_data, f, indent=2 if indent else None)
 
 
 def check_thresholds(analysis_data: Dict) -> Tuple[bool, List[str]]:
@@ -170,7 +245,7 @@ def check_thresholds(analysis_data: Dict) -> Tuple[bool, List[str]]:
         )
     
     # Check high-cost unused includes
-    high_cost_unused = len([o for o in opportunities if o.get('cost', 0) > 1500])
+    high_cost_unused = sum(1 for o in opportunities if o.get('cost', 0) > 1500)
     if high_cost_unused > MAX_HIGH_COST_UNUSED:
         messages.append(
             f"❌ FAIL: {high_cost_unused} high-cost unused headers exceeds threshold {MAX_HIGH_COST_UNUSED}"
@@ -196,8 +271,7 @@ def main():
         print(f"Error: {analysis_file} not found")
         sys.exit(1)
     
-    with open(analysis_file) as f:
-        analysis_data = json.load(f)
+    analysis_data = load_analysis(analysis_file)
     
     # Generate comment
     comment = generate_pr_comment(analysis_data)
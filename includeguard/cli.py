@@ -2,30 +2,38 @@
 Command-line interface for IncludeGuard
 """
 import click
+import contextlib
+from click.core import ParameterSource
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, TextColumn
 from rich.panel import Panel
-from rich.tree import Tree
+from rich.text import Text
 from rich.align import Align
 from rich import box
-from rich.syntax import Syntax
+import hashlib
+import heapq
 import json
+import os
 import sys
 import time
 import statistics
 import subprocess
 import tempfile
 from datetime import datetime
+from operator import itemgetter
 
-from includeguard.analyzer.parser import IncludeParser
-from includeguard.analyzer.graph import DependencyGraph
-from includeguard.analyzer.estimator import CostEstimator
-from includeguard.analyzer.forward_declaration import ForwardDeclarationDetector
-from includeguard.analyzer.pch_recommender import PCHRecommender
-from includeguard.analyzer.build_profiler import BuildProfiler
-from includeguard.ui.html_report import HTMLReportGenerator
+from typing import TYPE_CHECKING
+
+# Analyzer modules (networkx) and rich.syntax (pygments) are imported by the
+# commands that use them, so --help, ci-comment and compare start quickly
+if TYPE_CHECKING:
+    from includeguard.analyzer.graph import DependencyGraph
+    from includeguard.analyzer.pch_recommender import PCHRecommender
+
+# Reports counted between progress bar updates during cost estimation
+PROGRESS_BATCH = 32
 
 # Configure console for cross-platform compatibility
 console = Console(
@@ -52,11 +60,30 @@ def print_banner():
     ))
     console.print(Align.center("[dim]Optimize your C++ build times instantly[/dim]\n"))
 
+def _cache_dir() -> Path:
+    """Per-user cache directory for IncludeGuard"""
+    return Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'includeguard'
+
+def _parse_cache_file(project: Path) -> Path:
+    """On-disk parse cache for a project, one file per project root"""
+    key = hashlib.sha256(str(project).encode('utf-8')).hexdigest()[:16]
+    return _cache_dir() / 'parse' / f'{key}.json'
+
 @click.group()
 @click.version_option(version='0.1.0')
-def main():
+@click.option('--quiet', '-q', is_flag=True,
+              help='Suppress console output and progress displays (e.g. in CI); '
+                   'output files and exit status are unaffected')
+@click.pass_context
+def main(ctx, quiet):
     """IncludeGuard - Intelligent C++ Include Analysis"""
-    pass
+    # A quiet console drops output before any markup is parsed or rendered
+    console.quiet = quiet
+    if quiet:
+        # The analyzer and report modules print() their own status lines;
+        # discard stdout until the command finishes
+        devnull = ctx.with_resource(open(os.devnull, 'w', encoding='utf-8'))
+        ctx.with_resource(contextlib.redirect_stdout(devnull))
 
 @main.command()
 @click.argument('project_path', type=click.Path(exists=True))
@@ -68,71 +95,99 @@ def main():
               help='Maximum files to analyze (for large projects)')
 @click.option('--extensions', '-e', multiple=True,
               help='File extensions to analyze (e.g., .cpp .h)')
-def analyze(project_path, output, json_output, dot_output, max_files, extensions):
+@click.option('--cache/--no-cache', default=False,
+              help='Reuse parse results from previous runs for files whose contents are unchanged '
+                   '(default: off; stored under $XDG_CACHE_HOME/includeguard)')
+@click.option('--json-only', is_flag=True,
+              help='Only write --json-output (e.g. for ci-comment): skip forward declaration '
+                   'and PCH analysis, the HTML report and the result tables; '
+                   'cannot be combined with --output')
+def analyze(project_path, output, json_output, dot_output, max_files, extensions, cache, json_only):
     """Analyze a C++ project for include dependencies and costs"""
+    from includeguard.analyzer.parser import IncludeParser
+    from includeguard.analyzer.graph import DependencyGraph
+    from includeguard.analyzer.estimator import CostEstimator
+    from includeguard.analyzer.forward_declaration import ForwardDeclarationDetector
+    from includeguard.analyzer.pch_recommender import PCHRecommender
+    from includeguard.ui.html_report import HTMLReportGenerator
+    
+    if json_only:
+        if not json_output:
+            raise click.UsageError("--json-only requires --json-output")
+        ctx = click.get_current_context()
+        if ctx.get_parameter_source('output') is not ParameterSource.DEFAULT:
+            raise click.UsageError("--json-only skips the HTML report; drop --output")
+        output = None
     
     print_banner()
     
     project = Path(project_path).resolve()
     
-    if not project.exists():
-        console.print(f"[red]Error: Project path does not exist: {project}[/red]")
-        sys.exit(1)
-    
-    # Step 1: Parse files
+    # Steps 1-3 share one live display so Rich sets up and tears down its
+    # refresh thread once rather than per step
     with Progress(
         TextColumn("[progress.description]{task.description}"),
-        console=console
+        console=console,
+        disable=console.quiet,
+        refresh_per_second=4
     ) as progress:
+        # Step 1: Parse files
         task = progress.add_task("[cyan]Parsing C++ files...", total=None)
         
-        parser = IncludeParser(project)
+        parser = IncludeParser(project, cache_file=_parse_cache_file(project) if cache else None)
         
         # Use custom extensions if provided
         ext_list = list(extensions) if extensions else None
-        analyses = parser.parse_project(extensions=ext_list)
+        
+        def parse_progress(done: int, total: int):
+            progress.update(task, completed=done, total=total,
+                            description=f"[cyan]Parsing C++ files... {done}/{total}")
+        
+        analyses = parser.parse_project(extensions=ext_list, progress=parse_progress)
+        
+        try:
+            parser.save_parse_cache()
+        except OSError as e:
+            console.print(f"[yellow]Could not save parse cache:[/yellow] {e}")
+        else:
+            if cache:
+                console.print(f"[dim]Parse cache: {parser.cache_file}[/dim]")
         
         # Limit files if requested
         if max_files and len(analyses) > max_files:
             console.print(f"[yellow]Warning: Limiting analysis to {max_files} files[/yellow]")
             analyses = analyses[:max_files]
         
-        progress.update(task, completed=True)
-    
-    if not analyses:
-        console.print("[red]No C++ files found in project![/red]")
-        sys.exit(1)
-    
-    console.print(f"[green]✓[/green] Found {len(analyses)} C++ files\\n")
-    
-    # Display parser statistics
-    stats = parser.get_statistics(analyses)
-    _display_parser_stats(stats)
-    
-    # Step 2: Build dependency graph
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+        progress.update(task, visible=False)
+        
+        if not analyses:
+            console.print("[red]No C++ files found in project![/red]")
+            sys.exit(1)
+        
+        console.print(f"[green]✓[/green] Found {len(analyses)} C++ files\\n")
+        
+        # Display parser statistics
+        if not json_only:
+            stats = parser.get_statistics(analyses)
+            _display_parser_stats(stats)
+        
+        # Step 2: Build dependency graph
         task = progress.add_task("[cyan]Building dependency graph...", total=None)
         
         graph = DependencyGraph()
         graph.build(analyses)
         
-        progress.update(task, completed=True)
-    
-    graph_stats = graph.get_node_stats()
-    console.print(f"[green]✓[/green] Graph built: {graph_stats['total_nodes']} nodes, "
-                 f"{graph_stats['total_edges']} edges\\n")
-    
-    _display_graph_stats(graph_stats, graph)
-    
-    # Step 3: Estimate costs
-    console.print()
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
+        progress.update(task, visible=False)
+        
+        graph_stats = graph.get_node_stats()
+        console.print(f"[green]✓[/green] Graph built: {graph_stats['total_nodes']} nodes, "
+                     f"{graph_stats['total_edges']} edges\\n")
+        
+        if not json_only:
+            _display_graph_stats(graph_stats, graph)
+        
+        # Step 3: Estimate costs
+        console.print()
         task = progress.add_task(
             f"[cyan]Estimating build costs for {len(analyses)} files...",
             total=len(analyses)
@@ -141,53 +196,69 @@ def analyze(project_path, output, json_output, dot_output, max_files, extensions
         estimator = CostEstimator(graph)
         analysis_dict = {a.filepath: a for a in analyses}
         
+        # Advance in batches; per-report updates are mostly bookkeeping
+        # that the 4 Hz refresh never shows
         reports = []
-        for analysis in analyses:
-            report = estimator.generate_report(analysis, analysis_dict)
+        pending = 0
+        for report in estimator.generate_reports(analyses, analysis_dict):
             reports.append(report)
-            progress.advance(task)
+            pending += 1
+            if pending == PROGRESS_BATCH:
+                progress.advance(task, PROGRESS_BATCH)
+                pending = 0
+        progress.advance(task, pending)
+        
+        progress.update(task, visible=False)
     
     console.print(f"[green]✓[/green] Cost estimation complete\\n")
     
     # Sort reports by waste (most wasteful first)
-    reports.sort(key=lambda r: r['wasted_cost'], reverse=True)
+    reports.sort(key=itemgetter('wasted_cost'), reverse=True)
     
     # Generate project summary
     summary = estimator.generate_project_summary(reports)
     
-    # Step 4: Forward declaration analysis
-    console.print("[cyan]Analyzing forward declaration opportunities...[/cyan]")
-    fwd_detector = ForwardDeclarationDetector()
-    
-    all_fwd_opportunities = []
-    for analysis in analyses:
-        opportunities = fwd_detector.analyze_file(analysis.filepath, analysis)
-        if opportunities:
-            all_fwd_opportunities.extend([
-                {**opp, 'file': Path(analysis.filepath).name}
-                for opp in opportunities
-            ])
-    
-    # Step 5: PCH recommendations
-    console.print("[cyan]Generating PCH recommendations...[/cyan]")
-    pch_recommender = PCHRecommender()
-    pch_recommendations = pch_recommender.recommend_pch_headers(
-        analyses, graph, estimator, min_usage_count=3
-    )
-    
-    console.print(f"[green]✓[/green] Analysis complete\n")
-    
-    # Display results
-    _display_project_summary(summary)
-    _display_top_opportunities(summary)
-    
-    if all_fwd_opportunities:
-        _display_forward_declaration_opportunities(all_fwd_opportunities[:10])
-    
-    if pch_recommendations:
-        _display_pch_recommendations(pch_recommendations[:10], pch_recommender)
-    
-    _display_top_wasteful_files(reports[:10])
+    if json_only:
+        console.print(f"[green]✓[/green] Analysis complete\n")
+    else:
+        # Step 4: Forward declaration analysis
+        console.print("[cyan]Analyzing forward declaration opportunities...[/cyan]")
+        fwd_detector = ForwardDeclarationDetector()
+        
+        all_fwd_opportunities = []
+        for analysis in analyses:
+            opportunities = fwd_detector.analyze_file(analysis.filepath, analysis)
+            if opportunities:
+                # analyze_file returns fresh dicts, so tag them in place
+                filename = os.path.basename(analysis.filepath)
+                for opp in opportunities:
+                    opp['file'] = filename
+                all_fwd_opportunities.extend(opportunities)
+        
+        # The console shows the most confident few; the HTML report lists all
+        top_fwd_opportunities = heapq.nlargest(10, all_fwd_opportunities,
+                                               key=itemgetter('confidence'))
+        
+        # Step 5: PCH recommendations
+        console.print("[cyan]Generating PCH recommendations...[/cyan]")
+        pch_recommender = PCHRecommender()
+        pch_recommendations = pch_recommender.recommend_pch_headers(
+            analyses, graph, estimator, min_usage_count=3
+        )
+        
+        console.print(f"[green]✓[/green] Analysis complete\n")
+        
+        # Display results
+        _display_project_summary(summary)
+        _display_top_opportunities(summary)
+        
+        if top_fwd_opportunities:
+            _display_forward_declaration_opportunities(top_fwd_opportunities)
+        
+        if pch_recommendations:
+            _display_pch_recommendations(pch_recommendations[:10], pch_recommender)
+        
+        _display_top_wasteful_files(reports[:10])
     
     # Export HTML report
     if output:
@@ -206,7 +277,8 @@ def analyze(project_path, output, json_output, dot_output, max_files, extensions
             'reports': reports,
             'graph_stats': graph_stats
         }
-        Path(json_output).write_text(json.dumps(export_data, indent=2))
+        from includeguard.ci.github_action import save_analysis
+        save_analysis(export_data, json_output)
         console.print(f"[green]✓[/green] JSON data saved to: [bold]{json_output}[/bold]")
     
     # Export DOT graph
@@ -234,7 +306,7 @@ def _display_parser_stats(stats: dict):
     console.print(table)
     console.print()
 
-def _display_graph_stats(stats: dict, graph: DependencyGraph):
+def _display_graph_stats(stats: dict, graph: 'DependencyGraph'):
     """Display graph statistics"""
     table = Table(title="Dependency Graph", box=box.ROUNDED, show_header=False)
     table.add_column("Metric", style="cyan")
@@ -322,7 +394,7 @@ def _display_top_opportunities(summary: dict):
         table.add_row(
             opp['file'],
             opp['header'],
-            f"[{cost_style}]{opp['cost']:.0f}[/{cost_style}]",
+            Text(f"{opp['cost']:.0f}", style=cost_style),
             str(opp['line'])
         )
     
@@ -344,7 +416,7 @@ def _display_top_wasteful_files(reports: list):
     table.add_column("Waste %", justify="right", style="yellow")
     
     for i, report in enumerate(reports, 1):
-        filename = Path(report['file']).name
+        filename = os.path.basename(report['file'])
         waste_pct = report['potential_savings_pct']
         
         # Color code waste percentage
@@ -361,7 +433,7 @@ def _display_top_wasteful_files(reports: list):
             str(report['total_includes']),
             f"{report['total_estimated_cost']:.0f}",
             f"{report['wasted_cost']:.0f}",
-            f"[{waste_style}]{waste_pct:.1f}%[/{waste_style}]"
+            Text(f"{waste_pct:.1f}%", style=waste_style)
         )
     
     console.print(table)
@@ -383,13 +455,14 @@ def _display_forward_declaration_opportunities(opportunities: list):
             opp['file'],
             f"#include \"{opp['header']}\"",
             opp['suggestion'],
-            f"[{conf_color}]{opp['confidence']:.0%}[/{conf_color}]"
+            Text(f"{opp['confidence']:.0%}", style=conf_color)
         )
     
     console.print(table)
 
-def _display_pch_recommendations(recommendations: list, pch_recommender: PCHRecommender):
+def _display_pch_recommendations(recommendations: list, pch_recommender: 'PCHRecommender'):
     """Display PCH recommendations"""
+    from rich.syntax import Syntax
     console.print("\n[bold magenta]🔧 Precompiled Header Recommendations[/bold magenta]\n")
     console.print("[dim]Headers used frequently + expensive to compile → Good PCH candidates[/dim]\n")
     
@@ -406,14 +479,14 @@ def _display_pch_recommendations(recommendations: list, pch_recommender: PCHReco
             rec['header'],
             f"{rec['usage_count']} files",
             f"{rec['cost']:.0f}",
-            f"[{score_color}]{rec['pch_score']:.0f}[/{score_color}]",
+            Text(f"{rec['pch_score']:.0f}", style=score_color),
             f"{rec['estimated_savings']:.0f}"
         )
     
     console.print(table)
     
     # Show benefit estimate
-    benefit = pch_recommender.estimate_pch_benefit(recommendations)
+    benefit = pch_recommender.estimate_pch_benefit(recommendations, pch_recommender.header_files)
     console.print(f"\n[bold]Estimated speedup with PCH:[/bold] [green]{benefit['estimated_speedup']:.1f}%[/green] ")
     console.print(f"[dim]({benefit['files_benefiting']} files would benefit)[/dim]")
     
@@ -434,16 +507,15 @@ def _display_pch_recommendations(recommendations: list, pch_recommender: PCHReco
 @click.option('--json', '-j', is_flag=True, help='Output JSON for programmatic use')
 def inspect(filepath, verbose, json):
     """Inspect a single file's includes"""
+    from includeguard.analyzer.parser import IncludeParser
+    from includeguard.analyzer.graph import DependencyGraph
+    from includeguard.analyzer.estimator import CostEstimator
     
     if not json:
         print_banner()
     
     file_path = Path(filepath).resolve()
     
-    if not file_path.exists():
-        console.print(f"[red]Error: File does not exist: {file_path}[/red]")
-        sys.exit(1)
-    
     # Parse file
     parser = IncludeParser(file_path.parent)
     analysis = parser.parse_file(file_path)
@@ -562,8 +634,18 @@ def inspect(filepath, verbose, json):
 @click.argument('filepath', type=click.Path(exists=True))
 @click.option('--compiler', default='g++', help='Compiler to use (g++, clang++, cl)')
 @click.option('--flags', '-f', multiple=True, help='Compiler flags (e.g., -std=c++17)')
-def profile(filepath, compiler, flags):
+@click.option('--cache/--no-cache', default=False,
+              help='Reuse timings from earlier runs with the same compiler and version while the '
+                   'file and its headers are unchanged (default: off; cached timings reflect the '
+                   'machine load when they were taken)')
+@click.option('--jobs', '-j', default=1, type=click.IntRange(min=1),
+              help='Headers to profile concurrently (default: 1). Higher values are faster, but '
+                   'concurrent runs slow each other while the baseline is timed alone, so '
+                   'reported time savings are biased low; lines saved stay exact')
+def profile(filepath, compiler, flags, cache, jobs):
     """Profile actual compilation time impact of headers"""
+    from includeguard.analyzer.parser import IncludeParser
+    from includeguard.analyzer.build_profiler import BuildProfiler
     
     print_banner()
     
@@ -581,11 +663,12 @@ def profile(filepath, compiler, flags):
         return
     
     # Setup profiler
-    profiler = BuildProfiler(compiler)
+    cache_file = _cache_dir() / 'profiles.json' if cache else None
+    profiler = BuildProfiler(compiler, cache_file=cache_file)
     compile_flags = list(flags) if flags else ['-std=c++17']
     
     console.print("[cyan]Measuring baseline compilation time...[/cyan]")
-    baseline = profiler.profile_file(str(file_path), compile_flags)
+    baseline = profiler.profile_baseline(str(file_path), compile_flags)
     
     if not baseline.success:
         console.print(f"[red]Compilation failed:[/red] {baseline.error_message}")
@@ -599,19 +682,22 @@ def profile(filepath, compiler, flags):
     # Profile each header
     console.print("[cyan]Profiling individual headers (this may take a while)...[/cyan]\n")
     
-    results = []
     with Progress(TextColumn("[progress.description]{task.description}"),
-                 console=console) as progress:
+                 console=console, disable=console.quiet) as progress:
         task = progress.add_task("Profiling headers...", total=len(analysis.includes))
         
-        for inc in analysis.includes:
-            result = profiler.profile_with_and_without_header(
-                str(file_path),
-                inc.header,
-                compile_flags
-            )
-            results.append(result)
-            progress.advance(task)
+        results = profiler.profile_headers(
+            str(file_path),
+            [inc.header for inc in analysis.includes],
+            compile_flags,
+            max_workers=jobs,
+            progress=lambda done, total: progress.update(task, completed=done)
+        )
+    
+    try:
+        profiler.save_profile_cache()
+    except OSError as e:
+        console.print(f"[yellow]Could not save profile cache:[/yellow] {e}")
     
     # Filter out errors and sort by savings
     valid_results = [r for r in results if r.get('error') is None]
@@ -670,11 +756,10 @@ def profile(filepath, compiler, flags):
 def ci_comment(analysis_json, output, fail_on_threshold):
     """Generate CI/CD comment from analysis JSON for pull requests"""
     
-    from includeguard.ci.github_action import generate_pr_comment, check_thresholds
+    from includeguard.ci.github_action import generate_pr_comment, check_thresholds, load_analysis
     
     # Read analysis results
-    with open(analysis_json) as f:
-        analysis_data = json.load(f)
+    analysis_data = load_analysis(analysis_json)
     
     # Generate PR comment
     comment = generate_pr_comment(analysis_data)
@@ -684,7 +769,8 @@ def ci_comment(analysis_json, output, fail_on_threshold):
     
     console.print(f"[green]✓[/green] Generated PR comment: {output}")
     console.print("\n" + "="*80 + "\n")
-    console.print(comment)
+    # The comment is markdown, not Rich markup; write it through as-is
+    console.out(comment, highlight=False)
     console.print("\n" + "="*80 + "\n")
     
     # Check quality thresholds
@@ -714,8 +800,15 @@ def ci_comment(analysis_json, output, fail_on_threshold):
               help='Minimum confidence for auto-fix (0-1, default: 0.7)')
 @click.option('--json-input', '-j', type=click.Path(exists=True),
               help='Use existing JSON analysis instead of re-analyzing')
-def fix_generate(project_path, output, min_confidence, json_input):
+@click.option('--cache/--no-cache', default=False,
+              help='Reuse parse results from previous runs for files whose contents are unchanged '
+                   '(default: off; stored under $XDG_CACHE_HOME/includeguard)')
+def fix_generate(project_path, output, min_confidence, json_input, cache):
     """Generate Git patch to automatically fix include issues"""
+    from includeguard.analyzer.parser import IncludeParser
+    from includeguard.analyzer.graph import DependencyGraph
+    from includeguard.analyzer.estimator import CostEstimator
+    from includeguard.analyzer.forward_declaration import ForwardDeclarationDetector
     
     print_banner()
     
@@ -725,8 +818,8 @@ def fix_generate(project_path, output, min_confidence, json_input):
     # Either load existing analysis or run new analysis
     if json_input:
         console.print(f"[dim]Loading analysis from {json_input}...[/dim]")
-        with open(json_input) as f:
-            analysis_data = json.load(f)
+        from includeguard.ci.github_action import load_analysis
+        analysis_data = load_analysis(json_input)
         
         reports = analysis_data.get('reports', [])
         fwd_opportunities = analysis_data.get('forward_declarations', [])
@@ -738,13 +831,29 @@ def fix_generate(project_path, output, min_confidence, json_input):
         
         with Progress(
             TextColumn("[progress.description]{task.description}"),
-            console=console
+            console=console,
+            disable=console.quiet
         ) as progress:
             task = progress.add_task("Analyzing project...", total=None)
             
             # Parse project
-            parser = IncludeParser(project_root=project_path_obj)
-            analyses = parser.parse_project()
+            parser = IncludeParser(
+                project_root=project_path_obj,
+                cache_file=_parse_cache_file(project_path_obj) if cache else None
+            )
+            analyses = parser.parse_project(
+                progress=lambda done, total: progress.update(
+                    task, description=f"Parsing files... {done}/{total}"
+                )
+            )
+            
+            try:
+                parser.save_parse_cache()
+            except OSError as e:
+                console.print(f"[yellow]Could not save parse cache:[/yellow] {e}")
+            else:
+                if cache:
+                    console.print(f"[dim]Parse cache: {parser.cache_file}[/dim]")
             
             progress.update(task, description="Building dependency graph...")
             graph = DependencyGraph()
@@ -845,6 +954,9 @@ def fix_generate(project_path, output, min_confidence, json_input):
               help='Timeout per file in seconds (default: 30)')
 def benchmark(project_path, compiler, timeout):
     """Validate accuracy by comparing estimated vs actual compilation times"""
+    from includeguard.analyzer.parser import IncludeParser
+    from includeguard.analyzer.graph import DependencyGraph
+    from includeguard.analyzer.estimator import CostEstimator
     
     print_banner()
     
@@ -863,7 +975,8 @@ def benchmark(project_path, compiler, timeout):
     console.print("[cyan]Step 1: Running IncludeGuard analysis...[/cyan]")
     with Progress(
         TextColumn("[progress.description]{task.description}"),
-        console=console
+        console=console,
+        disable=console.quiet
     ) as progress:
         task = progress.add_task("Parsing files...", total=None)
         
@@ -897,7 +1010,8 @@ def benchmark(project_path, compiler, timeout):
     
     with Progress(
         TextColumn("[progress.description]{task.description}"),
-        console=console
+        console=console,
+        disable=console.quiet
     ) as progress:
         task = progress.add_task(f"Compiling 0/{len(analyses)} files...", total=len(analyses))
         
@@ -1046,21 +1160,19 @@ def benchmark(project_path, compiler, timeout):
 @click.argument('filepath', type=click.Path(exists=True))
 def explain(header, filepath):
     """Explain why a header was flagged as used/unused"""
+    from includeguard.analyzer.parser import IncludeParser
     
     print_banner()
     
     filepath_obj = Path(filepath).resolve()
     
-    if not filepath_obj.exists():
-        console.print(f"[red]Error: File not found: {filepath}[/red]")
-        sys.exit(1)
-    
     console.print(f"[bold cyan]Analyzing:[/bold cyan] {header} in {filepath_obj.name}\n")
     
     # Parse the file
     with Progress(
         TextColumn("[progress.description]{task.description}"),
-        console=console
+        console=console,
+        disable=console.quiet
     ) as progress:
         task = progress.add_task("Analyzing file...", total=None)
         
@@ -1190,6 +1302,9 @@ def explain(header, filepath):
 @click.argument('project_path', type=click.Path(exists=True))
 def stats(project_path):
     """Display project statistics and optimization priorities"""
+    from includeguard.analyzer.parser import IncludeParser
+    from includeguard.analyzer.graph import DependencyGraph
+    from includeguard.analyzer.estimator import CostEstimator
     
     print_banner()
     
@@ -1199,7 +1314,8 @@ def stats(project_path):
     # Run analysis
     with Progress(
         TextColumn("[progress.description]{task.description}"),
-        console=console
+        console=console,
+        disable=console.quiet
     ) as progress:
         task = progress.add_task("Scanning project...", total=None)
         
@@ -1260,7 +1376,7 @@ def stats(project_path):
     # Most problematic files
     console.print("\n[bold]Most Problematic Files (High Cost):[/bold]\n")
     
-    sorted_files = sorted(file_costs.items(), key=lambda x: x[1], reverse=True)
+    sorted_files = heapq.nlargest(10, file_costs.items(), key=itemgetter(1))
     
     file_table = Table(box=box.ROUNDED)
     file_table.add_column("File", style="cyan")
@@ -1268,7 +1384,7 @@ def stats(project_path):
     file_table.add_column("% of Total", justify="right")
     file_table.add_column("Issues", justify="right", style="red")
     
-    for filepath, cost in sorted_files[:10]:
+    for filepath, cost in sorted_files:
         filename = Path(filepath).name
         percentage = (cost / total_cost * 100) if total_cost > 0 else 0
         issues = file_unused.get(filepath, 0)
@@ -1434,6 +1550,9 @@ Overall waste: {overall_waste1:.1f}% → {overall_waste2:.1f}% ({overall_change:
               help='Poll interval in seconds (default: 2)')
 def watch(project_path, interval):
     """Monitor project files and automatically re-analyze on changes"""
+    from includeguard.analyzer.parser import IncludeParser
+    from includeguard.analyzer.graph import DependencyGraph
+    from includeguard.analyzer.estimator import CostEstimator
     
     print_banner()
     
@@ -73,55 +73,59 @@ class PatchGenerator:
                 print(f"Warning: Could not read {filepath}: {e}")
                 continue
             
+            # Split once; the same line lists feed both the fixes and the diff.
+            # A trailing newline ends the last line rather than starting one
+            lines = original.split('\n')
+            ends_with_newline = lines[-1] == ''
+            if ends_with_newline:
+                lines.pop()
+            
             # Apply fixes
             opportunities = report.get('optimization_opportunities', [])
             fwd_decls_for_file = fwd_by_file.get(filepath.name, [])
             
-            modified = self._apply_fixes(
-                original,
+            modified_lines = self._apply_fixes(
+                lines,
                 opportunities,
                 fwd_decls_for_file
             )
             
-            if modified != original:
+            if modified_lines is not None:
                 # Generate unified diff
                 diff_lines = list(difflib.unified_diff(
-                    original.splitlines(keepends=True),
-                    modified.splitlines(keepends=True),
+                    _with_line_endings(lines, ends_with_newline),
+                    _with_line_endings(modified_lines, ends_with_newline),
                     fromfile=f'a/{filepath}',
                     tofile=f'b/{filepath}',
                     lineterm=''
                 ))
                 
                 if diff_lines:
-                    patch = ''.join(diff_lines)
-                    patches.append(patch)
+                    patches.append(_format_diff(diff_lines))
                     self.files_modified.add(str(filepath))
         
         # Write patch file
         if patches:
             output = Path(output_path)
-            output.write_text('\n'.join(patches), encoding='utf-8')
+            output.write_text(''.join(patches), encoding='utf-8')
         
         return len(self.files_modified)
     
     def _apply_fixes(self,
-                    content: str,
+                    lines: List[str],
                     unused_includes: List[Dict],
-                    forward_decls: List[Dict]) -> str:
+                    forward_decls: List[Dict]) -> Optional[List[str]]:
         """
         Apply fixes to file content.
         
         Args:
-            content: Original file content
+            lines: Original file lines, without line endings
             unused_includes: List of unused include opportunities
             forward_decls: List of forward declaration opportunities
             
         Returns:
-            Modified content with fixes applied
+            Modified lines with fixes applied, or None if nothing changed
         """
-        lines = content.split('\n')
-        
         # Track which lines to remove/modify
         lines_to_remove: Set[int] = set()
         lines_to_modify: Dict[int, str] = {}
@@ -147,6 +151,9 @@ class PatchGenerator:
                             lines_to_modify[line_idx] = suggestion
                             self.fixes_applied += 1
         
+        if not lines_to_remove and not lines_to_modify:
+            return None
+        
         # Apply changes
         result_lines = []
         for i, line in enumerate(lines):
@@ -157,7 +164,7 @@ class PatchGenerator:
             else:
                 result_lines.append(line)
         
-        return '\n'.join(result_lines)
+        return result_lines
     
     def get_stats(self) -> Dict[str, int]:
         """Get statistics about applied fixes"""
@@ -167,6 +174,34 @@ class PatchGenerator:
         }
 
 
+def _with_line_endings(lines: List[str], ends_with_newline: bool) -> List[str]:
+    """Re-attach newlines, leaving the last line bare if the file has none"""
+    result = [line + '\n' for line in lines]
+    if result and not ends_with_newline:
+        result[-1] = lines[-1]
+    return result
+
+
+def _format_diff(diff_lines: List[str]) -> str:
+    """
+    Join unified_diff output into patch text.
+    
+    Body lines carry their own newline; a body line without one is the
+    last line of a file that has no trailing newline, which git expects
+    to be followed by a "\\ No newline at end of file" marker.
+    """
+    parts = []
+    for i, line in enumerate(diff_lines):
+        if line.endswith('\n'):
+            parts.append(line)
+        elif i < 2 or line.startswith('@@'):
+            # ---/+++ file headers and hunk headers
+            parts.append(line + '\n')
+        else:
+            parts.append(line + '\n\\ No newline at end of file\n')
+    return ''.join(parts)
+
+
 def generate_safe_patch(reports: List[Dict],
                        forward_decls: List[Dict],
                        output_path: str,
@@ -4,8 +4,21 @@ Flask API for IncludeGuard Dashboard
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
+from collections import OrderedDict
+from itertools import chain, islice
+from operator import itemgetter
 from pathlib import Path
+import heapq
+import os
 import sys
+import threading
+import time
+
+try:
+    import orjson  # Optional: serializes API responses several times faster
+    from flask.json.provider import DefaultJSONProvider  # Flask 2.2+
+except ImportError:
+    orjson = None
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -19,6 +32,34 @@ from includeguard.analyzer.pch_recommender import PCHRecommender
 app = Flask(__name__)
 CORS(app)
 
+if orjson is not None:
+    class ORJSONProvider(DefaultJSONProvider):
+        """Serialize responses with orjson, falling back for types it rejects"""
+        
+        def dumps(self, obj, **kwargs):
+            try:
+                return orjson.dumps(
+                    obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+                ).decode('utf-8')
+            except TypeError:
+                return super().dumps(obj, **kwargs)
+    
+    app.json = ORJSONProvider(app)
+
+# Files analyzed per request, to keep the dashboard responsive
+MAX_FILES = 50
+
+# Results for recently analyzed projects, keyed by a fingerprint of the
+# analyzed files, so refreshing an unchanged project skips the pipeline.
+# A hit is also checked against the headers those files resolved to, but
+# changes the fingerprint cannot see (e.g. a new header that now shadows
+# an include) only show up once the entry expires after ANALYSIS_CACHE_TTL
+# seconds
+MAX_CACHED_ANALYSES = 8
+ANALYSIS_CACHE_TTL = 300
+_analysis_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
 # Store latest analysis
 latest_analysis_data = None
 
@@ -42,13 +83,29 @@ def analyze_project():
         
         # Parse files
         parser = IncludeParser(project_root=str(project_path))
-        cpp_files = list(project_path.rglob('*.cpp')) + list(project_path.rglob('*.h'))
+        # Sources before headers, each walk stopped as soon as the limit is reached
+        cpp_files = list(islice(chain(parser.iter_source_files(['.cpp'], []),
+                                      parser.iter_source_files(['.h'], [])),
+                                MAX_FILES))
+        
+        fingerprint = _project_fingerprint(parser.project_root, cpp_files)
+        with _analysis_cache_lock:
+            entry = _analysis_cache.get(fingerprint)
+            if entry is not None:
+                _analysis_cache.move_to_end(fingerprint)
+        if entry is not None:
+            cached_at, deps, dep_stamps, cached = entry
+            if (time.monotonic() - cached_at < ANALYSIS_CACHE_TTL
+                    and _file_stamps(deps) == dep_stamps):
+                latest_analysis_data = cached
+                return jsonify(cached)
         
         analyses = []
-        for file_path in cpp_files[:50]:  # Limit to 50 files
+        for file_path in cpp_files:
             try:
-                analysis = parser.parse_file(str(file_path))
-                analyses.append(analysis)
+                analysis = parser.parse_file(file_path)
+                if analysis is not None:
+                    analyses.append(analysis)
             except Exception as e:
                 print(f"Error parsing {file_path}: {e}")
                 continue
@@ -73,6 +130,7 @@ def analyze_project():
             
             report = {
                 'file': analysis.filepath,
+                'name': os.path.basename(analysis.filepath),
                 'includes': [inc.header for inc in analysis.includes],
                 'total_lines': analysis.total_lines,
                 'cost_details': cost_results,
@@ -138,15 +196,15 @@ def analyze_project():
         for report in reports:
             for unused in report['unused_headers']:
                 opportunities.append({
-                    'file': Path(report['file']).name,
+                    'file': report['name'],
                     'header': unused['header'],
                     'cost': unused['cost'],
                     'line': 0
                 })
-        opportunities.sort(key=lambda x: x['cost'], reverse=True)
+        top_opportunities = heapq.nlargest(20, opportunities, key=itemgetter('cost'))
         
         # Top wasteful files
-        top_wasteful = sorted(reports, key=lambda x: x['wasted_cost'], reverse=True)[:10]
+        top_wasteful = heapq.nlargest(10, reports, key=itemgetter('wasted_cost'))
         
         # Prepare response
         result = {
@@ -159,10 +217,10 @@ def analyze_project():
                 'total_waste': total_waste,
                 'waste_percentage': waste_percentage
             },
-            'opportunities': opportunities[:20],
+            'opportunities': top_opportunities,
             'wasteful_files': [
                 {
-                    'file': Path(r['file']).name,
+                    'file': r['name'],
                     'includes': r['total_includes'],
                     'total_cost': r['total_estimated_cost'],
                     'wasted': r['wasted_cost'],
@@ -174,12 +232,23 @@ def analyze_project():
             'pch_recommendations': pch_recommendations[:10],
             'graph_stats': graph_stats,
             'chart_data': {
-                'files': [Path(r['file']).name for r in reports[:10]],
+                'files': [r['name'] for r in reports[:10]],
                 'costs': [r['total_estimated_cost'] for r in reports[:10]],
                 'waste': [r['wasted_cost'] for r in reports[:10]]
             }
         }
         
+        # Headers the parser resolved to a file (system and unresolved
+        # includes keep their bare name)
+        analyzed = set(cpp_files)
+        deps = sorted({inc.full_path for a in analyses for inc in a.includes
+                       if os.path.isabs(inc.full_path) and inc.full_path not in analyzed})
+        entry = (time.monotonic(), deps, _file_stamps(deps), result)
+        with _analysis_cache_lock:
+            _analysis_cache[fingerprint] = entry
+            if len(_analysis_cache) > MAX_CACHED_ANALYSES:
+                _analysis_cache.popitem(last=False)
+        
         latest_analysis_data = result
         return jsonify(result)
         
@@ -188,6 +257,21 @@ def analyze_project():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+def _project_fingerprint(project_root: Path, files: list) -> tuple:
+    """Identify a project state by its files' paths, sizes and mtimes"""
+    return (str(project_root), _file_stamps(files))
+
+def _file_stamps(files) -> tuple:
+    """(path, size, mtime) of each file, skipping files that are gone"""
+    stats = []
+    for f in files:
+        try:
+            st = os.stat(f)
+        except OSError:
+            continue
+        stats.append((f, st.st_size, st.st_mtime_ns))
+    return tuple(stats)
+
 @app.route('/api/latest', methods=['GET'])
 def get_latest():
     """Get latest analysis data"""
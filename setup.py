@@ -63,7 +63,10 @@ setup(
             "sphinx-rtd-theme>=1.0",
             "sphinx-autodoc-typehints>=1.12.0",
             "psutil>=5.8.0",
-        ]
+        ],
+        "fast": [
+            "orjson>=3.6",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -0,0 +1,207 @@
+"""
+Tests for BuildProfiler
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from includeguard.analyzer.build_profiler import BuildProfiler, CompilationProfile
+
+
+requires_compiler = pytest.mark.skipif(
+    shutil.which('g++') is None, reason="g++ not available"
+)
+
+
+class TestBuildProfiler:
+    """Test compiler-backed profiling"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source = self.temp_dir / "main.cpp"
+        self.source.write_text(
+            "#include <vector>\n"
+            "#include <map>\n"
+            "\n"
+            "int main() {\n"
+            "    std::vector<int> v;\n"
+            "    return 0;\n"
+            "}\n"
+        )
+        self.profiler = BuildProfiler()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_profile_files_empty(self):
+        """Test batch profiling with no files"""
+        assert self.profiler.profile_files([]) == []
+
+    def test_remove_header_include(self):
+        """Test only the include line naming the header is removed"""
+        content = (
+            b"#include <vector>\n"
+            b"  #include <map>\n"
+            b"// map is great\n"
+            b"int main() { return 0; }"
+        )
+
+        result = BuildProfiler._remove_header_include(content, 'map')
+
+        assert result == (
+            b"#include <vector>\n"
+            b"// map is great\n"
+            b"int main() { return 0; }"
+        )
+
+    def test_remove_header_include_matches_exact_name(self):
+        """Test a header name is not matched inside a longer one"""
+        content = (
+            b"#include <unordered_map>\n"
+            b"# include <map> // ordered\n"
+            b'#include "map"\n'
+        )
+
+        result = BuildProfiler._remove_header_include(content, '<map>')
+
+        assert result == b"#include <unordered_map>\n"
+
+    def test_profile_files_missing_compiler(self):
+        """Test batch profiling reports a missing compiler per file"""
+        profiler = BuildProfiler(compiler='definitely-not-a-compiler')
+        results = profiler.profile_files([str(self.source), str(self.source)])
+
+        assert len(results) == 2
+        assert all(isinstance(r, CompilationProfile) for r in results)
+        assert not any(r.success for r in results)
+
+    @requires_compiler
+    def test_profile_files_preserves_order(self):
+        """Test batch profiling returns results in input order"""
+        other = self.temp_dir / "other.cpp"
+        other.write_text("int main() { return 0; }\n")
+
+        results = self.profiler.profile_files([str(self.source), str(other)])
+
+        assert [r.source_file for r in results] == [str(self.source), str(other)]
+        assert all(r.success for r in results)
+        assert results[0].preprocessed_lines > results[1].preprocessed_lines
+
+    def test_profile_files_warms_baseline_cache(self):
+        """Test batch profiling fills the baseline cache once per file"""
+        with patch.object(self.profiler, 'profile_file',
+                          wraps=self.profiler.profile_file) as profile_file:
+            results = self.profiler.profile_files([str(self.source), str(self.source)])
+            baseline = self.profiler.profile_baseline(str(self.source))
+
+        assert results[0] is results[1] is baseline
+        assert profile_file.call_count == 1
+
+    @requires_compiler
+    def test_profile_with_and_without_header(self):
+        """Test removing an unused header reduces preprocessed lines"""
+        result = self.profiler.profile_with_and_without_header(
+            str(self.source), '<map>'
+        )
+
+        assert result['error'] is None
+        assert result['lines_saved'] > 0
+
+    @requires_compiler
+    def test_profile_headers_preserves_order(self):
+        """Test concurrent header profiling returns results in input order"""
+        progress = []
+
+        results = self.profiler.profile_headers(
+            str(self.source), ['<vector>', '<map>'],
+            progress=lambda done, total: progress.append((done, total))
+        )
+
+        assert [r['header'] for r in results] == ['<vector>', '<map>']
+        assert all(r['error'] is None for r in results)
+        assert progress == [(1, 2), (2, 2)]
+
+    def test_profile_with_and_without_header_missing_file(self):
+        """Test profiling a missing source file returns an error result"""
+        result = self.profiler.profile_with_and_without_header(
+            str(self.temp_dir / "missing.cpp"), '<map>'
+        )
+
+        assert result['error'] is not None
+        assert result['savings_ms'] == 0
+
+    def test_profile_baseline_is_cached(self):
+        """Test the baseline is preprocessed once per unchanged file"""
+        with patch.object(self.profiler, 'profile_file',
+                          wraps=self.profiler.profile_file) as profile_file:
+            first = self.profiler.profile_baseline(str(self.source))
+            second = self.profiler.profile_baseline(str(self.source))
+
+        assert first is second
+        assert profile_file.call_count == 1
+
+    def test_profile_baseline_invalidated_on_change(self):
+        """Test editing the file invalidates its cached baseline"""
+        first = self.profiler.profile_baseline(str(self.source))
+
+        stat = self.source.stat()
+        self.source.write_text("int main() { return 0; }\n")
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        second = self.profiler.profile_baseline(str(self.source))
+
+        assert first is not second
+        assert len(self.profiler._baseline_cache) == 1
+
+    def test_read_depfile(self):
+        """Test dependency files with continuations and escaped spaces"""
+        header = self.temp_dir / "my header.h"
+        header.write_text("")
+        depfile = self.temp_dir / "main.d"
+        depfile.write_text(
+            f"main.o: {self.source} \\\n"
+            f" {str(header).replace(' ', chr(92) + ' ')}\n"
+        )
+
+        deps = BuildProfiler._read_depfile(str(depfile))
+
+        assert set(deps) == {str(self.source), str(header)}
+        assert deps[str(header)][1] == 0
+
+    @requires_compiler
+    def test_profile_cache_persists_across_instances(self):
+        """Test a saved profile cache is reused by a later run"""
+        cache_file = self.temp_dir / "cache" / "profiles.json"
+        profiler = BuildProfiler(cache_file=str(cache_file))
+        first = profiler.profile_with_and_without_header(str(self.source), 'map')
+        profiler.save_profile_cache()
+
+        profiler = BuildProfiler(cache_file=str(cache_file))
+        with patch.object(profiler, '_run_preprocessor') as run:
+            second = profiler.profile_with_and_without_header(str(self.source), 'map')
+
+        assert run.call_count == 0
+        assert second == first
+
+    @requires_compiler
+    def test_profile_cache_invalidated_by_header_change(self):
+        """Test editing an included header invalidates the saved profile"""
+        header = self.temp_dir / "local.h"
+        header.write_text("int local();\n")
+        self.source.write_text('#include "local.h"\nint main() { return local(); }\n')
+        cache_file = self.temp_dir / "profiles.json"
+        profiler = BuildProfiler(cache_file=str(cache_file))
+        first = profiler.profile_baseline(str(self.source))
+        profiler.save_profile_cache()
+
+        header.write_text("int local();\nint other();\n")
+
+        profiler = BuildProfiler(cache_file=str(cache_file))
+        second = profiler.profile_baseline(str(self.source))
+
+        assert first.success and second.success
+        assert second.preprocessed_lines == first.preprocessed_lines + 1
@@ -309,6 +309,32 @@ class TestGraphErrorHandling:
         except Exception:
             pass  # Expected if pydot not installed
     
+    def test_export_dot_writes_nodes_and_edges(self):
+        """Test DOT export streams quoted nodes and edges"""
+        self.graph.graph.add_node("main.cpp", is_external=False)
+        self.graph.graph.add_node('say "hi".h', is_external=True)
+        self.graph.graph.add_edge("main.cpp", 'say "hi".h')
+        
+        output_file = self.temp_dir / "graph.dot"
+        self.graph.export_dot(output_file)
+        
+        content = output_file.read_text(encoding='utf-8')
+        assert content.startswith("strict digraph {\n")
+        assert '"main.cpp" [is_external="False"];' in content
+        assert '"main.cpp" -> "say \\"hi\\".h";' in content
+        assert content.endswith("}\n")
+    
+    def test_export_dot_keeps_windows_path_backslashes(self):
+        """Test DOT export does not double backslashes in node names"""
+        self.graph.graph.add_edge("C:\\src\\main.cpp", "C:\\src\\a.h")
+        
+        output_file = self.temp_dir / "graph.dot"
+        self.graph.export_dot(output_file)
+        
+        content = output_file.read_text(encoding='utf-8')
+        assert '"C:\\src\\main.cpp" -> "C:\\src\\a.h";' in content
+        assert "\\\\" not in content
+    
     def test_export_graphml(self):
         """Test GraphML export"""
         self.graph.graph.add_node("test.cpp")
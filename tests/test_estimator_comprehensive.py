@@ -4,6 +4,7 @@ Comprehensive tests for CostEstimator - covering all edge cases
 import pytest
 from pathlib import Path
 import tempfile
+from unittest.mock import patch
 from includeguard.analyzer.estimator import CostEstimator
 from includeguard.analyzer.parser import FileAnalysis, Include
 from includeguard.analyzer.graph import DependencyGraph
@@ -153,6 +154,35 @@ class TestCostEstimation:
         
         # A should cost more than B (includes transitive)
         assert cost_a > cost_b
+    
+    def test_transitive_cost_computed_once_per_header(self):
+        """Test the dependency graph is walked once per header"""
+        analyses = [
+            FileAnalysis(
+                filepath="/project/a.h",
+                includes=[Include("b.h", 1, False, "/project/b.h")],
+                total_lines=10,
+                code_lines=8
+            ),
+            FileAnalysis(
+                filepath="/project/b.h",
+                includes=[],
+                total_lines=10,
+                code_lines=8
+            )
+        ]
+        
+        self.graph.build(analyses)
+        estimator = CostEstimator(self.graph)
+        
+        with patch.object(self.graph, 'get_transitive_dependencies',
+                          wraps=self.graph.get_transitive_dependencies) as deps:
+            first = estimator._estimate_transitive_cost("/project/a.h")
+            calls = deps.call_count
+            second = estimator._estimate_transitive_cost("/project/a.h")
+        
+        assert first == second > 0
+        assert deps.call_count == calls
 
 
 class TestUnusedIncludeDetection:
@@ -205,7 +235,24 @@ int main() {
         
         assert is_used == False
         assert confidence < 0.4  # Low confidence = unused
-    
+
+    def test_usage_rechecked_after_file_changes(self):
+        """Test: cached file content is invalidated when the file changes"""
+        import os
+        source = self.temp_dir / "test.cpp"
+        source.write_text("#include <iostream>\nint main() { return 0; }\n")
+
+        estimator = CostEstimator(self.graph)
+        is_used, _ = estimator.check_header_usage(str(source), "iostream")
+        assert is_used == False
+
+        stat = source.stat()
+        source.write_text("#include <iostream>\nint main() { std::cout << 1; }\n")
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        is_used, _ = estimator.check_header_usage(str(source), "iostream")
+        assert is_used == True
+
     def test_vector_used_push_back(self):
         """Test: vector detected as used with push_back"""
         source = self.temp_dir / "test.cpp"
@@ -422,7 +469,17 @@ class TestCostFormulaComponents:
         
         # Unknown (default is 300)
         assert estimator._get_base_cost('my_custom.h') == 300
-    
+
+    def test_base_cost_prefers_most_specific_match(self):
+        """Test specific entries win over generic substrings"""
+        estimator = CostEstimator(DependencyGraph())
+
+        assert estimator._get_base_cost('unordered_map') == 1000
+        assert estimator._get_base_cost('map') == 900
+        assert estimator._get_base_cost('boost/asio.hpp') == 4000
+        assert estimator._get_base_cost('boost/spirit/include/qi.hpp') == 5000
+        assert estimator._get_base_cost('boost/config.hpp') == 3000
+
     def test_file_size_cost_components(self):
         """Test file size cost calculation with different factors"""
         analyses = []
@@ -590,6 +647,40 @@ int main() {
         finally:
             import shutil
             shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_reports_in_process_pool(self, monkeypatch):
+        """Test parallel reports match in-process reports, in order"""
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            analyses = []
+            for i in range(6):
+                source = temp_dir / f"file{i}.cpp"
+                source.write_text(f"#include <vector>\n#include <map>\nint f{i}() {{ return 0; }}\n")
+                analyses.append(FileAnalysis(
+                    filepath=str(source),
+                    includes=[
+                        Include("vector", 1, True, "<vector>"),
+                        Include("map", 2, True, "<map>")
+                    ],
+                    total_lines=3,
+                    code_lines=3
+                ))
+            
+            graph = DependencyGraph()
+            graph.build(analyses)
+            analysis_dict = {a.filepath: a for a in analyses}
+            
+            serial = [CostEstimator(graph).generate_report(a, analysis_dict) for a in analyses]
+            
+            monkeypatch.setattr('includeguard.analyzer.estimator.PARALLEL_REPORT_THRESHOLD', 1)
+            parallel = list(CostEstimator(graph).generate_reports(analyses, analysis_dict, max_workers=2))
+            
+            assert parallel == serial
+        
+        finally:
+            import shutil
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 # Run tests if executed directly
@@ -0,0 +1,73 @@
+"""
+Tests for ForwardDeclarationDetector
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+from includeguard.analyzer.forward_declaration import ForwardDeclarationDetector
+from includeguard.analyzer.parser import IncludeParser
+
+
+class TestForwardDeclarationDetector:
+    """Test forward declaration opportunity detection"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.parser = IncludeParser(self.temp_dir)
+        self.detector = ForwardDeclarationDetector()
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _analyze(self, content):
+        source = self.temp_dir / "main.cpp"
+        source.write_text(content)
+        return self.detector.analyze_file(str(source), self.parser.parse_file(source))
+
+    def test_pointer_only_usage_suggested(self):
+        """Test a class used only through pointers can be forward declared"""
+        opportunities = self._analyze(
+            '#include "widget.h"\n'
+            'void draw(Widget* w);\n'
+            'void resize(Widget& w);\n'
+        )
+
+        assert len(opportunities) == 1
+        assert opportunities[0]['class_name'] == 'Widget'
+        assert opportunities[0]['suggestion'] == 'class Widget;'
+        assert opportunities[0]['confidence'] >= 0.5
+
+    def test_value_usage_not_suggested(self):
+        """Test a class used by value needs its full definition"""
+        opportunities = self._analyze(
+            '#include "widget.h"\n'
+            'void draw(Widget* w);\n'
+            'Widget local;\n'
+        )
+
+        assert opportunities == []
+
+    def test_each_include_judged_separately(self):
+        """Test usage of one class does not leak into another's verdict"""
+        opportunities = self._analyze(
+            '#include "widget.h"\n'
+            '#include "engine.h"\n'
+            'void draw(Widget* w);\n'
+            'Engine engine;\n'
+            'Engine* other;\n'
+        )
+
+        assert [o['class_name'] for o in opportunities] == ['Widget']
+
+    def test_comments_and_strings_ignored(self):
+        """Test usage inside comments and literals does not count"""
+        opportunities = self._analyze(
+            '#include "widget.h"\n'
+            'void draw(Widget* w);\n'
+            'const char* url = "http://x/\\" Widget local;";\n'
+            '/* Widget other;\n'
+            '   spans lines */\n'
+        )
+
+        assert [o['class_name'] for o in opportunities] == ['Widget']
@@ -216,6 +216,17 @@ class TestCircularDependencies:
         cycles = graph.find_cycles()
         assert len(cycles) >= 1
     
+    def test_overlapping_cycles_reported_once(self):
+        """Test files sharing several cycles form a single group"""
+        graph = DependencyGraph()
+        graph.graph.add_edges_from([
+            ("a.h", "b.h"), ("b.h", "a.h"), ("b.h", "c.h"), ("c.h", "b.h"),
+            ("main.cpp", "a.h")
+        ])
+        
+        assert graph.find_cycles() == [["a.h", "b.h", "c.h"]]
+        assert graph.get_node_stats()['cycles'] == 1
+    
     def test_no_cycles(self):
         """Test graph with no cycles"""
         analyses = [
@@ -348,6 +359,16 @@ class TestDependencyQueries:
         depth_a = graph.get_dependency_depth("/project/a.cpp")
         assert depth_a == 2  # a -> b -> c is 2 levels deep
     
+    def test_dependency_depth_uses_shortest_paths(self):
+        """Test depth counts the shortest path to each descendant, even with cycles"""
+        graph = DependencyGraph()
+        graph.graph.add_edges_from([
+            ("a.cpp", "b.h"), ("b.h", "c.h"), ("a.cpp", "c.h"), ("c.h", "a.cpp")
+        ])
+        
+        assert graph.get_dependency_depth("a.cpp") == 1
+        assert graph.get_dependency_depth("b.h") == 2
+    
     def test_reverse_dependencies(self):
         """Test getting reverse dependencies (who depends on me)"""
         analyses = [
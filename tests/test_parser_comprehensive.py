@@ -5,6 +5,7 @@ import pytest
 from pathlib import Path
 import tempfile
 import shutil
+from unittest.mock import patch
 from includeguard.analyzer.parser import IncludeParser, FileAnalysis, Include
 
 
@@ -240,6 +241,30 @@ int main() {
         finally:
             shutil.rmtree(temp_dir, ignore_errors=True)
     
+    def test_include_stays_on_one_line(self):
+        """Test blank lines and unterminated names do not bleed into a match"""
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            test_file = temp_dir / "lines.cpp"
+            test_file.write_text(
+                '\n'
+                '   \n'
+                '#include <vector>\n'
+                '#include "unterminated.h\n'
+                '#include "real.h"\n'
+            )
+            
+            parser = IncludeParser(temp_dir)
+            analysis = parser.parse_file(test_file)
+            
+            assert [(i.header, i.line_number) for i in analysis.includes] == [
+                ('vector', 3), ('real.h', 5)
+            ]
+        
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
     def test_ifndef_include_guard(self):
         """Test parsing file with include guards"""
         temp_dir = Path(tempfile.mkdtemp())
@@ -506,6 +531,123 @@ void helper() {}
         finally:
             shutil.rmtree(temp_dir, ignore_errors=True)
     
+    def test_parse_project_in_process_pool(self, monkeypatch):
+        """Test parallel parsing matches in-process parsing, in order"""
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            (temp_dir / "utils.h").write_text("#pragma once\n#include <vector>\n")
+            for i in range(8):
+                (temp_dir / f"file{i}.cpp").write_text(
+                    f'#include "utils.h"\n#include <map>\nclass C{i} {{}};\n'
+                )
+            
+            parser = IncludeParser(temp_dir)
+            serial = parser.parse_project(max_workers=1)
+            
+            monkeypatch.setattr('includeguard.analyzer.parser.PARALLEL_PARSE_THRESHOLD', 1)
+            parallel = parser.parse_project(max_workers=2)
+            
+            assert len(parallel) == 9
+            assert parallel == serial
+        
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_parse_project_reports_progress(self, monkeypatch):
+        """Test the progress callback counts every file, pooled or not"""
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            for i in range(5):
+                (temp_dir / f"file{i}.cpp").write_text("#include <map>\n")
+            
+            parser = IncludeParser(temp_dir)
+            calls = []
+            parser.parse_project(max_workers=1, progress=lambda done, total: calls.append((done, total)))
+            assert calls == [(i, 5) for i in range(1, 6)]
+            
+            monkeypatch.setattr('includeguard.analyzer.parser.PARALLEL_PARSE_THRESHOLD', 1)
+            calls = []
+            parser.parse_project(max_workers=2, progress=lambda done, total: calls.append((done, total)))
+            assert calls == [(i, 5) for i in range(1, 6)]
+        
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_shared_header_resolved_once(self):
+        """Test a header included from one directory is looked up once"""
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            (temp_dir / "utils.h").write_text("#pragma once\n")
+            for i in range(3):
+                (temp_dir / f"file{i}.cpp").write_text('#include "utils.h"\n')
+            
+            parser = IncludeParser(temp_dir)
+            with patch.object(parser, '_find_header', wraps=parser._find_header) as find:
+                analyses = parser.parse_project()
+            
+            resolved = {inc.full_path for a in analyses for inc in a.includes}
+            assert resolved == {str((temp_dir / "utils.h").resolve())}
+            assert find.call_count == 1
+        
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_parse_cache_persists_across_instances(self):
+        """Test unchanged files are taken from a saved parse cache"""
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            project = temp_dir / "project"
+            project.mkdir()
+            (project / "utils.h").write_text("#pragma once\n")
+            (project / "main.cpp").write_text('#include "utils.h"\n#include <map>\nclass A {};\n')
+            cache_file = temp_dir / "cache" / "parse.json"
+            
+            parser = IncludeParser(project, cache_file=cache_file)
+            first = parser.parse_project()
+            parser.save_parse_cache()
+            
+            parser = IncludeParser(project, cache_file=cache_file)
+            with patch.object(parser, 'parse_file', wraps=parser.parse_file) as parse:
+                second = parser.parse_project()
+            
+            assert second == first
+            assert parse.call_count == 0
+            
+            # Edited contents are parsed again
+            (project / "main.cpp").write_text('#include <vector>\n')
+            parser = IncludeParser(project, cache_file=cache_file)
+            with patch.object(parser, 'parse_file', wraps=parser.parse_file) as parse:
+                third = parser.parse_project()
+            
+            assert parse.call_count == 1
+            main = next(a for a in third if a.filepath.endswith("main.cpp"))
+            assert [inc.header for inc in main.includes] == ["vector"]
+        
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_project_inside_excluded_directory_name(self):
+        """Test exclusions apply below the project root, not above it"""
+        temp_dir = Path(tempfile.mkdtemp())
+        
+        try:
+            project = temp_dir / "build" / "project"
+            (project / "build").mkdir(parents=True)
+            (project / "main.cpp").write_text("#include <vector>")
+            (project / "build" / "generated.cpp").write_text("#include <map>")
+            
+            parser = IncludeParser(project)
+            analyses = parser.parse_project()
+            
+            assert [Path(a.filepath).name for a in analyses] == ["main.cpp"]
+        
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
     def test_ignore_non_cpp_files(self):
         """Test that non-C++ files are ignored"""
         temp_dir = Path(tempfile.mkdtemp())
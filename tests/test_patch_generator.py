@@ -0,0 +1,83 @@
+"""
+Tests for PatchGenerator
+"""
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from includeguard.fixer.patch_generator import PatchGenerator
+
+
+requires_git = pytest.mark.skipif(shutil.which('git') is None, reason="git not installed")
+
+
+class TestPatchGenerator:
+    """Test patches are valid unified diffs that git applies"""
+
+    def setup_method(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _generate(self, monkeypatch, content, line, forward_decl=None):
+        """Write b.cpp, generate a patch for one fix on `line`, return the patch"""
+        monkeypatch.chdir(self.temp_dir)
+        (self.temp_dir / "b.cpp").write_bytes(content.encode('utf-8'))
+        reports = [{
+            'file': 'b.cpp',
+            'optimization_opportunities': [] if forward_decl else [
+                {'line': line, 'likely_used': False, 'cost': 1000}
+            ],
+        }]
+        forward_decls = [
+            {'file': 'b.cpp', 'line': line, 'confidence': 0.9, 'suggestion': forward_decl}
+        ] if forward_decl else []
+
+        assert PatchGenerator().generate_patch(reports, forward_decls, 'fix.patch') == 1
+        return (self.temp_dir / "fix.patch").read_text(encoding='utf-8')
+
+    def _apply(self):
+        """Apply fix.patch with git and return the patched b.cpp"""
+        subprocess.run(['git', 'apply', '--check', 'fix.patch'], cwd=self.temp_dir,
+                       check=True, capture_output=True)
+        subprocess.run(['git', 'apply', 'fix.patch'], cwd=self.temp_dir,
+                       check=True, capture_output=True)
+        return (self.temp_dir / "b.cpp").read_bytes().decode('utf-8')
+
+    @requires_git
+    def test_file_with_trailing_newline(self, monkeypatch):
+        """Test a file ending in a newline needs no end-of-file marker"""
+        patch = self._generate(monkeypatch, '#include <string>\nint x;\n', line=1)
+
+        assert patch.startswith('--- a/b.cpp\n+++ b/b.cpp\n@@ ')
+        assert 'No newline at end of file' not in patch
+        assert self._apply() == 'int x;\n'
+
+    @requires_git
+    def test_file_without_trailing_newline(self, monkeypatch):
+        """Test the last line of a file without a newline is marked"""
+        patch = self._generate(monkeypatch, '#include <string>\nint x;', line=1)
+
+        assert patch.endswith(' int x;\n\\ No newline at end of file\n')
+        assert self._apply() == 'int x;'
+
+    @requires_git
+    def test_removing_last_line_without_trailing_newline(self, monkeypatch):
+        """Test removing the unterminated last line yields a valid hunk"""
+        patch = self._generate(monkeypatch, 'int x;\n#include <string>', line=2)
+
+        assert '-#include <string>\n\\ No newline at end of file\n' in patch
+        assert self._apply() == 'int x;'
+
+    @requires_git
+    def test_replacing_last_line_without_trailing_newline(self, monkeypatch):
+        """Test both sides of a changed unterminated last line are marked"""
+        patch = self._generate(monkeypatch, 'int x;\n#include "widget.h"', line=2,
+                               forward_decl='class Widget;')
+
+        assert patch.count('\\ No newline at end of file\n') == 2
+        assert self._apply() == 'int x;\nclass Widget;'